@@ -0,0 +1,51 @@
+import hashlib
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified before the queryset is
+    evaluated or anything is serialized.
+
+    Views implement ``get_validator_state()`` and return a cheap description
+    of everything the response depends on (a version, a timestamp, ...), or
+    None to skip conditional handling. ``get_last_modified()`` may return a
+    datetime to also emit Last-Modified.
+    """
+
+    def get_validator_state(self):
+        return None
+
+    def get_last_modified(self):
+        return None
+
+    def get_etag(self, request):
+        state = self.get_validator_state()
+        if state is None:
+            return None
+
+        # The query string selects the page/representation, so it is part of the tag
+        raw = f"{request.get_full_path()}|{state}"
+        return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        last_modified = self.get_last_modified() if etag is not None else None
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+
+        if etag is not None:
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                response["ETag"] = etag
+                return response
+
+        response = super().get(request, *args, **kwargs)
+
+        if etag is not None:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
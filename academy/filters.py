@@ -0,0 +1,19 @@
+from rest_framework.filters import OrderingFilter
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that appends ``id`` in the direction of the first term,
+    so equal values (prices, ratings) page deterministically and the order
+    matches the ``(..., field, id)`` composite indexes.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+
+        ordering = list(ordering)
+        if not any(term.lstrip("-") in ("id", "pk") for term in ordering):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return ordering
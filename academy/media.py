@@ -0,0 +1,230 @@
+import base64
+import hashlib
+import hmac
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote, urlencode
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+from django.views.decorators.http import require_safe
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework.negotiation import BaseContentNegotiation
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class UnsatisfiableRange(Exception):
+    pass
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Media views return plain Django responses, so a player's ``Accept:
+    video/*`` must not end in 406 during DRF content negotiation.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+def parse_byte_range(header, size):
+    """
+    Parse a ``Range`` header into an inclusive ``(start, end)`` pair.
+
+    Returns None when the header should be ignored and the whole file sent
+    (malformed, multiple ranges) and raises UnsatisfiableRange when no byte
+    of the file is selected.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        suffix = int(end)
+        if suffix == 0 or size == 0:
+            raise UnsatisfiableRange
+        return max(size - suffix, 0), size - 1
+
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        raise UnsatisfiableRange
+    end = int(end) if end else size - 1
+    return start, min(end, size - 1)
+
+
+def _if_range_matches(request, etag, mtime):
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        # If-Range only allows strong comparison
+        return if_range == etag
+    return parse_http_date_safe(if_range) == mtime
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload_response(storage, name, content_type):
+    offload = settings.MEDIA_OFFLOAD.lower()
+    if offload == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        response["X-Accel-Redirect"] = f"{prefix}/{quote(name)}"
+        return response
+    if offload == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = storage.path(name)
+        return response
+    return None
+
+
+def serve_file(request, storage, name, content_type=None):
+    """
+    Serve a file from local storage without loading it into memory.
+
+    Whole files go out through FileResponse, which the WSGI server can send
+    with sendfile; a single byte range is answered with 206 Partial Content
+    and streamed in chunks. With MEDIA_OFFLOAD set, the front-end server
+    sends the file (and handles ranges) instead.
+    """
+    content_type = content_type or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+    response = _offload_response(storage, name, content_type)
+    if response is not None:
+        return response
+
+    path = storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("File not found.")
+
+    size = stat.st_size
+    mtime = int(stat.st_mtime)
+    raw = f"{name}|{size}|{mtime}"
+    etag = quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is not None:
+        response["ETag"] = etag
+        return response
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and _if_range_matches(request, etag, mtime):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(path, start, length), status=206, content_type=content_type
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    return response
+
+
+# Signed media URLs
+#
+# A signed URL is /api/media/<name>?expires=<unix time>&signature=<sig>, where
+# sig is the unpadded urlsafe base64 HMAC-SHA256 of "<name>:<expires>" keyed
+# with MEDIA_SIGNING_KEY (or a key derived from SECRET_KEY when that is unset).
+# Anything holding the key (this view, or the front proxy) can verify a
+# request without a database lookup.
+
+def _media_signing_key():
+    if settings.MEDIA_SIGNING_KEY:
+        return settings.MEDIA_SIGNING_KEY.encode()
+    # A one-way derivation, so the key never exposes SECRET_KEY
+    return salted_hmac("academy.media.signed-url", "", algorithm="sha256").digest()
+
+
+def _media_signature(name, expires):
+    key = _media_signing_key()
+    digest = hmac.new(key, f"{name}:{expires}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def media_url_expiry():
+    # Expiries fall on TTL boundaries so the same URL is issued for a while,
+    # keeping lesson responses and browser caches stable. Valid for TTL..2*TTL.
+    ttl = settings.MEDIA_URL_TTL
+    return (int(time.time()) // ttl + 2) * ttl
+
+
+def signed_media_url(name, request=None):
+    """Time-limited URL for a stored file, absolute when a request is given."""
+    expires = media_url_expiry()
+    query = urlencode({"expires": expires, "signature": _media_signature(name, expires)})
+    url = f"{reverse('signed-media', kwargs={'name': name})}?{query}"
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def verify_media_signature(name, expires, signature):
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_media_signature(name, expires), signature or "")
+
+
+media_storage = FileSystemStorage()
+
+
+@require_safe
+def serve_signed_media(request, name):
+    """
+    Serve a file named by a signed URL. Access was checked when the URL was
+    issued, so no session, token or database work happens here.
+    """
+    if not verify_media_signature(
+        name, request.GET.get("expires"), request.GET.get("signature")
+    ):
+        return HttpResponseForbidden("Invalid or expired media link.")
+
+    return serve_file(request, media_storage, name)
@@ -0,0 +1,148 @@
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination whose cursor holds the values of every ordering field,
+    ending with the unique ``id``. DRF's CursorPagination only keys on the
+    first field and skips ties with an OFFSET, which degrades into OFFSET
+    scans (and stops advancing past ``offset_cutoff``) when many rows share
+    a value, such as free courses sorted by price. Here every page starts
+    with a range condition on the composite index instead.
+
+    Ordering fields must be non-null.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if ordering[-1].lstrip("-") not in ("id", "pk"):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return tuple(ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for term in ordering:
+            value = getattr(instance, term.lstrip("-"))
+            values.append(value if isinstance(value, int) else str(value))
+        return json.dumps(values, separators=(",", ":"))
+
+    def _decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A tampered cursor, or one made under another ordering, must not
+        # reach the database as a value of the wrong type
+        opts = self.queryset_model._meta
+        try:
+            return [
+                opts.get_field(term.lstrip("-")).to_python(value)
+                for term, value in zip(self.ordering, values)
+            ]
+        except (FieldDoesNotExist, ValidationError, ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _keyset_filter(self, values, reverse):
+        """
+        Rows after ``values`` in the page direction, nested as
+        ``a >= x AND (a > x OR (b >= y AND (b > y OR ...)))`` so the leading
+        condition is a range on the first indexed column.
+        """
+        condition = None
+        for term, value in reversed(list(zip(self.ordering, values))):
+            field = term.lstrip("-")
+            descending = term.startswith("-") != reverse
+            after = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+            if condition is None:
+                condition = after
+            else:
+                at_or_after = Q(**{f"{field}__{'lte' if descending else 'gte'}": value})
+                condition = at_or_after & (after | condition)
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.queryset_model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            _, reverse, current_position = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            values = self._decode_position(current_position)
+            queryset = queryset.filter(self._keyset_filter(values, reverse))
+
+        # One extra row tells whether there is a page after this one
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None
+
+        if self.page:
+            first = self._get_position_from_instance(self.page[0], self.ordering)
+            last = self._get_position_from_instance(self.page[-1], self.ordering)
+            self.previous_position, self.next_position = first, last
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Paged back past the start; continue from where the cursor was
+            cursor = Cursor(offset=0, reverse=False, position=self.cursor.position)
+        else:
+            cursor = Cursor(offset=0, reverse=False, position=self.next_position)
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            cursor = Cursor(offset=0, reverse=True, position=self.cursor.position)
+        else:
+            cursor = Cursor(offset=0, reverse=True, position=self.previous_position)
+        return self.encode_cursor(cursor)
+
+
+class CreatedAtCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination over ``-created_at`` with ``id`` as tie-breaker.
+    Every page is a single indexed range query, with no COUNT or OFFSET scan.
+    """
+
+    ordering = ("-created_at", "-id")
+
+
+class EnrolledAtCursorPagination(KeysetCursorPagination):
+    ordering = ("-enrolled_at", "-id")
@@ -14,6 +14,7 @@ from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     "django_filters",
     "drf_spectacular",
     "corsheaders",
+    "filestore",
     "users.apps.UsersConfig",
     "courses",
     "lessons",
@@ -80,15 +82,29 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+# Password hashing (users.hashing). With PASSWORD_HASHING_POOL_SIZE > 0 each
+# web process hashes and verifies passwords in that many worker processes,
+# with at most PASSWORD_HASHING_MAX_PENDING (default 2x) in flight. Requests
+# that wait longer than PASSWORD_HASHING_QUEUE_TIMEOUT for a slot get a 503
+# with Retry-After, so sign-up bursts cannot starve other traffic.
+PASSWORD_HASHING_POOL_SIZE = int(os.getenv("PASSWORD_HASHING_POOL_SIZE", 0))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 0)) or None
+PASSWORD_HASHING_QUEUE_TIMEOUT = 0.2  # seconds
+PASSWORD_HASHING_RETRY_AFTER = 5  # seconds
+PASSWORD_HASHING_TIMEOUT = 30  # seconds before a stuck hash is answered with 503
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
     ],
+    # Ordered cheapest first; EmailRateThrottle reads the body and is only
+    # added to the auth endpoints through users.throttles.EmailThrottleMixin
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
         "users.throttles.IPRateThrottle",
-        "users.throttles.EmailRateThrottle",
+        "users.throttles.AnonRateThrottle",
+        "users.throttles.UserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/day",
@@ -98,7 +114,7 @@ REST_FRAMEWORK = {
     },
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.OrderingFilter",
+        "academy.filters.StableOrderingFilter",
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -119,6 +135,10 @@ DJOSER = {
 SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ACCESS_TOKEN_LIFETIME": timedelta(days=10),
+    # Tokens carry role/verification claims so requests skip the users query
+    # (see users.authentication); revoked jtis are kept in users.RevokedToken.
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.RevocableTokenRefreshSerializer",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -171,6 +191,33 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# Throttle counters and enrollment lookups must be shared by every worker
+# process, and the throttles rely on atomic incr and on counters not being
+# evicted early. Production therefore defaults to Redis (requires the redis
+# package); set CACHE_BACKEND/CACHE_LOCATION for Memcached or another server.
+# Development and tests use a file cache shared on one host: its add/incr are
+# read-then-write and it culls a third of its entries past MAX_ENTRIES, so
+# throttle limits there are approximate.
+
+if DEBUG:
+    DEFAULT_CACHE_BACKEND = "django.core.cache.backends.filebased.FileBasedCache"
+    DEFAULT_CACHE_LOCATION = os.path.join(tempfile.gettempdir(), "eduverse-cache")
+else:
+    DEFAULT_CACHE_BACKEND = "django.core.cache.backends.redis.RedisCache"
+    DEFAULT_CACHE_LOCATION = "redis://127.0.0.1:6379/1"
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", DEFAULT_CACHE_BACKEND),
+        "LOCATION": os.getenv("CACHE_LOCATION", DEFAULT_CACHE_LOCATION),
+    }
+}
+
+if CACHES["default"]["BACKEND"].endswith(".FileBasedCache"):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": 10000}
 
 
 # Password validation
@@ -220,6 +267,20 @@ STORAGES = {
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Protected media (lesson videos) can be handed off to the front-end server
+# instead of being streamed by Django: "x-accel-redirect" for nginx, with an
+# internal location at MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT, or
+# "x-sendfile" for Apache/lighttpd. Empty means Django serves the bytes.
+MEDIA_OFFLOAD = os.getenv("MEDIA_OFFLOAD", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
+# Lesson media is linked through HMAC-signed URLs (see academy/media.py).
+# To verify them on the front proxy, set a dedicated MEDIA_SIGNING_KEY and
+# share that; when unset, a key derived from SECRET_KEY is used, which only
+# Django itself can check. Never give the proxy SECRET_KEY.
+MEDIA_SIGNING_KEY = os.getenv("MEDIA_SIGNING_KEY", "")
+MEDIA_URL_TTL = int(os.getenv("MEDIA_URL_TTL", 3600))  # seconds
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -231,6 +292,21 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "no-reply@eduverse.local"
 ADMINS = [("Admin", "admin@example.com")]  # used by signals for admin notifications
 
+# Notification emails go through the users.OutboundEmail outbox. With
+# EMAIL_OUTBOX_SEND_ON_COMMIT a background thread sends them after commit;
+# `python manage.py send_queued_emails` delivers retries and leftovers.
+EMAIL_OUTBOX_SEND_ON_COMMIT = os.getenv("EMAIL_OUTBOX_SEND_ON_COMMIT", "True") == "True"
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60  # seconds, doubled after each failed attempt
+EMAIL_OUTBOX_LEASE = 300  # seconds a sender holds a claimed email before it is due again
+
+# Students imported without a password (users.importing) are emailed this link
+STUDENT_IMPORT_SET_PASSWORD_URL = (
+    os.getenv("FRONTEND_URL", "http://localhost:3000")
+    + "/password/reset/confirm/{uid}/{token}"
+)
+
 # Stripe Configuration
 STRIPE_PUBLIC_KEY = os.getenv("STRIPE_PUBLIC_KEY", "")
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
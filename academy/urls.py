@@ -19,6 +19,9 @@ from django.contrib import admin
 from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
+from rest_framework.routers import SimpleRouter
+from academy.media import serve_signed_media
+from users.views import AuthTokenObtainPairView, AuthUserViewSet, TokenRevokeAPIView
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularSwaggerView,
@@ -26,8 +29,16 @@ from drf_spectacular.views import (
 )
 
 
+# Djoser's email-taking endpoints, overridden to add the email throttle.
+# Listed before the djoser includes so these routes match first.
+auth_router = SimpleRouter()
+auth_router.register("users", AuthUserViewSet)
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/auth/", include(auth_router.urls)),
+    path("api/auth/jwt/create/", AuthTokenObtainPairView.as_view(), name="jwt-create"),
+    path("api/auth/jwt/revoke/", TokenRevokeAPIView.as_view(), name="jwt-revoke"),
     path("api/auth/", include("djoser.urls")),
     path("api/auth/", include("djoser.urls.jwt")),
     path("api/users/", include("users.urls")),
@@ -36,6 +47,7 @@ urlpatterns = [
     path("api/enrollments/", include("enrollments.urls")),
     path("api/reviews/", include("reviews.urls")),
     path("api/payments/", include("payments.urls")),
+    path("api/media/<path:name>", serve_signed_media, name="signed-media"),
     
     # Schema file (JSON)
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -15,21 +15,51 @@ class CourseAdmin(admin.ModelAdmin):
     )
     list_filter = ("is_published", "created_at")
     search_fields = ("title", "description", "instructor__user__username")
-    readonly_fields = ("average_rating", "reviews_count", "created_at")
+    readonly_fields = (
+        "average_rating",
+        "reviews_count",
+        "rating_sum",
+        "rating_1_count",
+        "rating_2_count",
+        "rating_3_count",
+        "rating_4_count",
+        "rating_5_count",
+        "published_lessons_count",
+        "published_duration",
+        "created_at",
+    )
     fieldsets = (
         (
             "Basic Information",
             {"fields": ("title", "description", "instructor", "price")},
         ),
         ("Status", {"fields": ("is_published",)}),
-        ("Statistics", {"fields": ("average_rating", "reviews_count")}),
+        (
+            "Statistics",
+            {
+                "fields": (
+                    "average_rating",
+                    "reviews_count",
+                    "rating_sum",
+                    (
+                        "rating_1_count",
+                        "rating_2_count",
+                        "rating_3_count",
+                        "rating_4_count",
+                        "rating_5_count",
+                    ),
+                    ("published_lessons_count", "published_duration"),
+                )
+            },
+        ),
         ("Timestamps", {"fields": ("created_at",)}),
     )
 
 
 @admin.register(Section)
 class SectionAdmin(admin.ModelAdmin):
-    list_display = ("title", "course", "order")
+    list_display = ("title", "course", "order", "published_lessons_count", "published_duration")
+    readonly_fields = ("published_lessons_count", "published_duration")
     list_filter = ("course",)
     search_fields = ("title", "course__title")
     ordering = ("course", "order")
@@ -0,0 +1,142 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from .models import CatalogVersion, Course, CourseCatalogEntry
+from .search import index_course, unindex_course
+from .serializers import PublicCourseSerializer, PublicCourseSummarySerializer
+
+# Counters that are updated in place on the Course row (e.g. by review
+# signals) are read live when serving, so they never go stale in the payload.
+LIVE_FIELDS = ("average_rating", "reviews_count")
+
+CATALOG_VERSION_PK = 1
+
+
+def catalog_source_queryset():
+    return Course.objects.select_related("instructor__user").prefetch_related(
+        "sections", "sections__lessons"
+    )
+
+
+def _without_live_fields(data):
+    payload = dict(data)
+    for field in LIVE_FIELDS:
+        payload.pop(field, None)
+    return payload
+
+
+def build_catalog_payload(course):
+    return _without_live_fields(PublicCourseSerializer(course).data)
+
+
+def build_catalog_summary(course):
+    return _without_live_fields(PublicCourseSummarySerializer(course).data)
+
+
+def rebuild_catalog_entry(course_id):
+    """
+    Rebuild (or drop) the catalog entry and search document of a single
+    course. Returns the entry, or None when the course is gone or unpublished.
+    """
+    course = catalog_source_queryset().filter(pk=course_id).first()
+
+    if course is None:
+        return None
+
+    if not course.is_published:
+        CourseCatalogEntry.objects.filter(course_id=course_id).delete()
+        unindex_course(course_id)
+        return None
+
+    index_course(course)
+
+    entry, _ = CourseCatalogEntry.objects.update_or_create(
+        course=course,
+        defaults={
+            "payload": build_catalog_payload(course),
+            "summary": build_catalog_summary(course),
+        },
+    )
+    return entry
+
+
+def get_catalog_version():
+    """
+    Version of the public catalog as a whole. It lives in the database so
+    every worker sees a bump as soon as it commits.
+    """
+    version = (
+        CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_catalog_version():
+    updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+        version=F("version") + 1
+    )
+    if not updated:
+        _, created = CatalogVersion.objects.get_or_create(
+            pk=CATALOG_VERSION_PK, defaults={"version": 1}
+        )
+        if not created:
+            # Another bump created the row first; count this one too
+            CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+                version=F("version") + 1
+            )
+
+
+def get_course_version(course_id, published_only=False):
+    """
+    Return ``(content_version, updated_at)`` of a course from a single
+    primary-key read, or None when it does not exist.
+    """
+    courses = Course.objects.filter(pk=course_id)
+    if published_only:
+        courses = courses.filter(is_published=True)
+    return courses.values_list("content_version", "updated_at").first()
+
+
+def mark_course_changed(course_id, was_published=False):
+    """
+    Bump the content version of a course. When the course is published, or
+    was before this change (``was_published``), also rebuild its catalog
+    entry and bump the catalog version once the current transaction commits;
+    drafts are not in the public catalog, so editing one leaves it alone.
+    """
+    if course_id is None:
+        return
+
+    courses = Course.objects.filter(pk=course_id)
+    courses.update(content_version=F("content_version") + 1, updated_at=Now())
+    if not was_published and not courses.filter(is_published=True).exists():
+        return
+
+    def rebuild():
+        rebuild_catalog_entry(course_id)
+        bump_catalog_version()
+
+    transaction.on_commit(rebuild)
+
+
+def serve_catalog_payload(course, summary=False):
+    """
+    Return the public representation of a published course from its
+    prebuilt entry, rebuilding the entry first if it is missing.
+    """
+    entry = getattr(course, "catalog_entry", None)
+    if entry is None:
+        entry = rebuild_catalog_entry(course.pk)
+
+    if entry is None:
+        payload = {}
+    elif summary:
+        payload = dict(entry.summary)
+    else:
+        payload = dict(entry.payload)
+
+    for field in LIVE_FIELDS:
+        payload[field] = getattr(course, field)
+    return payload
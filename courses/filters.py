@@ -0,0 +1,21 @@
+import django_filters
+from .models import Course
+
+
+class PublicCourseFilter(django_filters.FilterSet):
+    min_price = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
+    max_price = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    is_free = django_filters.BooleanFilter(method="filter_is_free")
+    min_rating = django_filters.NumberFilter(
+        field_name="average_rating", lookup_expr="gte"
+    )
+    instructor = django_filters.NumberFilter(field_name="instructor_id")
+
+    class Meta:
+        model = Course
+        fields = ["min_price", "max_price", "is_free", "min_rating", "instructor"]
+
+    def filter_is_free(self, queryset, name, value):
+        if value:
+            return queryset.filter(price=0)
+        return queryset.filter(price__gt=0)
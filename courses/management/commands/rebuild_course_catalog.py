@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from courses.catalog import rebuild_catalog_entry
+from courses.models import Course, CourseCatalogEntry, CourseSearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rebuild the catalog entries and search documents of all published courses."
+
+    def handle(self, *args, **options):
+        stale = CourseCatalogEntry.objects.filter(course__is_published=False)
+        removed, _ = stale.delete()
+        CourseSearchDocument.objects.filter(course__is_published=False).delete()
+
+        rebuilt = 0
+        course_ids = Course.objects.filter(is_published=True).values_list(
+            "id", flat=True
+        )
+        for course_id in course_ids.iterator():
+            if rebuild_catalog_entry(course_id) is not None:
+                rebuilt += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {rebuilt} catalog entries, removed {removed} stale ones."
+            )
+        )
@@ -0,0 +1,24 @@
+from academy.conditional import ConditionalGetMixin
+from .catalog import get_course_version
+
+
+class CourseConditionalGetMixin(ConditionalGetMixin):
+    """Conditional GET keyed on the content version of the course in the URL."""
+
+    course_url_kwarg = "course_id"
+    published_only = False
+
+    def get_course_version(self):
+        if not hasattr(self, "_course_version"):
+            self._course_version = get_course_version(
+                self.kwargs[self.course_url_kwarg], published_only=self.published_only
+            )
+        return self._course_version
+
+    def get_validator_state(self):
+        version = self.get_course_version()
+        return None if version is None else version[0]
+
+    def get_last_modified(self):
+        version = self.get_course_version()
+        return None if version is None else version[1]
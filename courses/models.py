@@ -1,3 +1,4 @@
+from datetime import timedelta
 from django.db import models
 from users.models import InstructorProfile
 
@@ -13,9 +14,33 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     average_rating = models.FloatField(default=0)
     reviews_count = models.PositiveIntegerField(default=0)
+    # Running total and 1-5 star histogram of review ratings,
+    # maintained incrementally by reviews.utils
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    # Maintained by lessons.utils when lessons are published, edited or deleted
+    published_lessons_count = models.PositiveIntegerField(default=0)
+    published_duration = models.DurationField(default=timedelta(0))
+    # Bumped whenever the course, its syllabus or its reviews change;
+    # used as HTTP validators by the public course and lesson endpoints
+    content_version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        # One index per public catalog sort, so each filter/sort combination
+        # is an index range scan (see the query plan tests in courses/tests.py)
+        indexes = [
+            models.Index(fields=["is_published", "-created_at", "-id"]),
+            models.Index(fields=["is_published", "-average_rating", "-id"]),
+            models.Index(fields=["is_published", "-reviews_count", "-id"]),
+            models.Index(fields=["is_published", "price", "id"]),
+            models.Index(fields=["instructor", "is_published", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -25,6 +50,9 @@ class Section(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="sections")
     title = models.CharField(max_length=255)
     order = models.PositiveIntegerField()
+    # Maintained by lessons.utils alongside the course totals
+    published_lessons_count = models.PositiveIntegerField(default=0)
+    published_duration = models.DurationField(default=timedelta(0))
 
     class Meta:
         ordering = ["order"]
@@ -32,3 +60,56 @@ class Section(models.Model):
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
+
+
+class CourseCatalogEntry(models.Model):
+    """
+    Prebuilt public payload of a published course, rebuilt by courses.catalog
+    whenever the course, one of its sections or one of its lessons changes.
+    """
+
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="catalog_entry",
+    )
+    payload = models.JSONField(default=dict)
+    summary = models.JSONField(default=dict)
+    rebuilt_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Catalog entry: {self.course_id}"
+
+
+class CourseSearchDocument(models.Model):
+    """
+    Searchable text of a published course, kept in step with its catalog
+    entry. courses.search indexes this table with the database's full-text
+    engine (an FTS5 table on SQLite, a FULLTEXT index on MySQL).
+    """
+
+    course = models.OneToOneField(
+        Course,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.CharField(max_length=255)
+    instructor_name = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"Search document: {self.course_id}"
+
+
+class CatalogVersion(models.Model):
+    """
+    Single-row counter bumped whenever any published course changes; the
+    validator of the public catalog list and search endpoints.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Catalog version {self.version}"
@@ -0,0 +1,163 @@
+import re
+from django.db import connections
+from django.db.models import Q
+from .models import CourseSearchDocument
+
+SEARCH_TABLE = CourseSearchDocument._meta.db_table
+FTS_TABLE = "courses_search_fts"
+FULLTEXT_INDEX = "courses_search_fulltext"
+
+# bm25 weights of the FTS5 columns: title, instructor_name, body
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_search_document(course):
+    """Searchable fields of a course loaded with catalog_source_queryset()."""
+    parts = [course.description]
+    for section in course.sections.all():
+        parts.append(section.title)
+        parts.extend(
+            lesson.title for lesson in section.lessons.all() if lesson.is_published
+        )
+
+    return {
+        "title": course.title,
+        "instructor_name": course.instructor.user.username,
+        "body": "\n".join(parts),
+    }
+
+
+def index_course(course):
+    CourseSearchDocument.objects.update_or_create(
+        course=course, defaults=build_search_document(course)
+    )
+
+
+def unindex_course(course_id):
+    CourseSearchDocument.objects.filter(course_id=course_id).delete()
+
+
+def search_tokens(query):
+    return TOKEN_RE.findall(query)[:10]
+
+
+def _search_sqlite(connection, tokens, limit):
+    # Quoting every token keeps FTS5 syntax out of user input; "tok"* is a prefix match
+    match = " ".join('"{}"*'.format(token) for token in tokens)
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s",
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_mysql(connection, tokens, limit):
+    against = " ".join(f"+{token}*" for token in tokens)
+    match = "MATCH (title, instructor_name, body) AGAINST (%s IN BOOLEAN MODE)"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT course_id FROM {SEARCH_TABLE} WHERE {match} "
+            f"ORDER BY {match} DESC LIMIT %s",
+            [against, against, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_fallback(tokens, limit):
+    documents = CourseSearchDocument.objects.all()
+    for token in tokens:
+        documents = documents.filter(
+            Q(title__icontains=token)
+            | Q(instructor_name__icontains=token)
+            | Q(body__icontains=token)
+        )
+    return list(documents.values_list("course_id", flat=True)[:limit])
+
+
+def search_course_ids(query, limit):
+    """
+    Ids of published courses matching every word of ``query`` as a prefix,
+    best match first.
+    """
+    tokens = search_tokens(query)
+    if not tokens:
+        return []
+
+    connection = connections[CourseSearchDocument.objects.db]
+    if connection.vendor == "sqlite":
+        return _search_sqlite(connection, tokens, limit)
+    if connection.vendor == "mysql":
+        return _search_mysql(connection, tokens, limit)
+    return _search_fallback(tokens, limit)
+
+
+def _table_exists(connection, name):
+    with connection.cursor() as cursor:
+        return name in connection.introspection.table_names(cursor)
+
+
+def _create_sqlite_index(connection):
+    columns = "title, instructor_name, body"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, "
+            f"content='{SEARCH_TABLE}', content_rowid='course_id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        insert = (
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) "
+            "VALUES (new.course_id, new.title, new.instructor_name, new.body);"
+        )
+        delete = (
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+            "VALUES ('delete', old.course_id, old.title, old.instructor_name, old.body);"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {SEARCH_TABLE} "
+            f"BEGIN {insert} END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {SEARCH_TABLE} "
+            f"BEGIN {delete} END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {SEARCH_TABLE} "
+            f"BEGIN {delete} {insert} END"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _create_mysql_index(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            [SEARCH_TABLE, FULLTEXT_INDEX],
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} "
+                f"ON {SEARCH_TABLE} (title, instructor_name, body)"
+            )
+
+
+def ensure_search_index(using="default", **kwargs):
+    """
+    Create the full-text index over CourseSearchDocument if it is missing.
+    Connected to post_migrate; the index is kept current by triggers
+    (SQLite) or by the engine itself (MySQL).
+    """
+    connection = connections[using]
+    if not _table_exists(connection, SEARCH_TABLE):
+        return
+
+    if connection.vendor == "sqlite":
+        if not _table_exists(connection, FTS_TABLE):
+            _create_sqlite_index(connection)
+    elif connection.vendor == "mysql":
+        _create_mysql_index(connection)
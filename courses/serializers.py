@@ -12,8 +12,11 @@ class SectionSerializer(serializers.ModelSerializer):
             "id",
             "title",
             "order",
+            "published_lessons_count",
+            "published_duration",
             "lessons",
         ]
+        read_only_fields = ["published_lessons_count", "published_duration"]
 
 
 class InstructorCourseSerializer(serializers.ModelSerializer):
@@ -28,6 +31,14 @@ class InstructorCourseSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "is_published", "created_at"]
 
+    def update(self, instance, validated_data):
+        # Write only the edited columns, so rating and lesson counters
+        # updated in place with F() since this row was read are kept
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
 
 class CoursePublishSerializer(serializers.ModelSerializer):
     class Meta:
@@ -50,6 +61,42 @@ class PublicCourseSerializer(serializers.ModelSerializer):
             "instructor_name",
             "average_rating",
             "reviews_count",
+            "published_lessons_count",
+            "published_duration",
             "created_at",
             "sections",
         ]
+
+
+class PublicCourseSummarySerializer(serializers.ModelSerializer):
+    instructor_name = serializers.CharField(
+        source="instructor.user.username", read_only=True
+    )
+
+    class Meta:
+        model = Course
+        fields = [
+            "id",
+            "title",
+            "instructor_name",
+            "average_rating",
+            "reviews_count",
+            "published_lessons_count",
+            "published_duration",
+            "created_at",
+        ]
+
+
+class CourseCatalogSerializer(serializers.BaseSerializer):
+    """
+    Read-only representation of a published course served from its
+    prebuilt catalog entry instead of the nested serializer stack.
+    Pass ``summary=True`` in the context to serve the summary payload.
+    """
+
+    def to_representation(self, instance):
+        from .catalog import serve_catalog_payload
+
+        return serve_catalog_payload(
+            instance, summary=self.context.get("summary", False)
+        )
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from lessons.models import Lesson
+from .catalog import bump_catalog_version, mark_course_changed
+from .models import Course, Section
+
+
+def _lesson_course_id(lesson):
+    if Lesson.section.is_cached(lesson) and lesson.section is not None:
+        return lesson.section.course_id
+    if lesson.course_id:
+        return lesson.course_id
+    if lesson.section_id:
+        return (
+            Section.objects.filter(pk=lesson.section_id)
+            .values_list("course_id", flat=True)
+            .first()
+        )
+    return None
+
+
+@receiver(pre_save, sender=Course)
+def remember_course_published(sender, instance, raw=False, **kwargs):
+    # Unpublishing a course has to drop it from the catalog as well
+    was_published = False
+    if not instance._state.adding and instance.pk is not None:
+        was_published = sender._base_manager.filter(
+            pk=instance.pk, is_published=True
+        ).exists()
+    instance._catalog_was_published = was_published
+
+
+@receiver(post_save, sender=Course)
+def rebuild_catalog_on_course_change(sender, instance, **kwargs):
+    was_published = getattr(instance, "_catalog_was_published", False)
+    instance._catalog_was_published = instance.is_published
+    mark_course_changed(instance.pk, was_published=was_published)
+
+
+@receiver(post_delete, sender=Course)
+def bump_catalog_on_course_delete(sender, instance, **kwargs):
+    if instance.is_published:
+        transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def rebuild_catalog_on_section_change(sender, instance, **kwargs):
+    mark_course_changed(instance.course_id)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def rebuild_catalog_on_lesson_change(sender, instance, **kwargs):
+    mark_course_changed(_lesson_course_id(instance))
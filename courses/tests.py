@@ -1,3 +1,181 @@
+import json
+from urllib.parse import parse_qs, urlencode, urlsplit
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from unittest import skipUnless
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIClient
+from academy.pagination import CreatedAtCursorPagination
+from users.models import InstructorProfile, User
+from .catalog import get_catalog_version
+from .models import Course, CourseCatalogEntry, Section
 
-# Create your tests here.
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are checked on SQLite")
+class PublicCourseListQueryPlanTests(TestCase):
+    """Every catalog filter/sort combination must be served from an index."""
+
+    combinations = [
+        "",
+        "?view=summary",
+        "?ordering=created_at",
+        "?ordering=-average_rating",
+        "?ordering=average_rating",
+        "?ordering=-reviews_count",
+        "?ordering=price",
+        "?ordering=-price",
+        "?is_free=true",
+        "?is_free=false&ordering=price",
+        "?min_price=10&max_price=50&ordering=price",
+        "?min_rating=4&ordering=-average_rating",
+        "?instructor=1",
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def course_queries(self, query_string):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/courses/public/courses/{query_string}")
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if 'FROM "courses_course"' in q["sql"]]
+
+    def query_plan(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def test_catalog_queries_use_indexes(self):
+        for query_string in self.combinations:
+            with self.subTest(query_string=query_string):
+                queries = self.course_queries(query_string)
+                self.assertTrue(queries)
+                for sql in queries:
+                    plan = self.query_plan(sql)
+                    # A full table scan has no "USING ... INDEX" suffix
+                    self.assertNotIn("SCAN courses_course", plan, plan)
+                    self.assertNotIn("SCAN TABLE courses_course", plan, plan)
+
+    def test_sorts_do_not_need_a_temporary_sort(self):
+        for query_string in self.combinations:
+            if "min_" in query_string or "is_free" in query_string:
+                continue
+            with self.subTest(query_string=query_string):
+                for sql in self.course_queries(query_string):
+                    plan = self.query_plan(sql)
+                    self.assertFalse(
+                        any("TEMP B-TREE" in step for step in plan), plan
+                    )
+
+
+class PublicCourseListPaginationTests(TestCase):
+    """Cursors carry every ordering value, so ties never repeat or stall."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email="instructor@example.com", username="instructor"
+        )
+        instructor = InstructorProfile.objects.create(user=user, is_verified=True)
+        Course.objects.bulk_create(
+            Course(
+                instructor=instructor,
+                title=f"Course {i}",
+                description="About",
+                is_published=True,
+                price=0 if i % 5 else 20,
+            )
+            for i in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def page_ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [course["id"] for course in data["results"]], data
+
+    def test_paging_through_ties_returns_every_course_once(self):
+        for ordering in ("price", "-price", "-average_rating", "-reviews_count"):
+            with self.subTest(ordering=ordering):
+                seen = []
+                url = f"/api/courses/public/courses/?view=summary&ordering={ordering}"
+                while url:
+                    ids, data = self.page_ids(url)
+                    seen.extend(ids)
+                    url = data["next"]
+                self.assertEqual(len(seen), 25)
+                self.assertEqual(len(set(seen)), 25)
+
+    def test_previous_link_returns_the_earlier_page(self):
+        first, data = self.page_ids("/api/courses/public/courses/?ordering=price")
+        second, data = self.page_ids(data["next"])
+        previous, _ = self.page_ids(data["previous"])
+        self.assertEqual(previous, first)
+        self.assertFalse(set(first) & set(second))
+
+    def test_tampered_or_mismatched_cursor_is_not_found(self):
+        paginator = CreatedAtCursorPagination()
+        paginator.base_url = "/api/courses/public/courses/"
+        tampered = paginator.encode_cursor(
+            Cursor(offset=0, reverse=False, position=json.dumps(["abc", "def"]))
+        )
+
+        _, data = self.page_ids("/api/courses/public/courses/?ordering=-created_at")
+        query = parse_qs(urlsplit(data["next"]).query)
+        by_price = "/api/courses/public/courses/?" + urlencode(
+            {"cursor": query["cursor"][0], "ordering": "price"}
+        )
+
+        for url in (tampered, by_price):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+
+class CatalogVersionTests(TestCase):
+    """Only changes to published courses invalidate the public catalog."""
+
+    def setUp(self):
+        user = User.objects.create_user(
+            email="instructor@example.com", username="instructor"
+        )
+        self.instructor = InstructorProfile.objects.create(user=user, is_verified=True)
+
+    def save(self, instance, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save(**kwargs)
+
+    def test_draft_edits_keep_the_catalog_version(self):
+        course = Course(instructor=self.instructor, title="Draft", description="About")
+        self.save(course)
+        self.save(Section(course=course, title="Intro", order=1))
+        course.title = "Still a draft"
+        self.save(course, update_fields=["title", "updated_at"])
+
+        self.assertEqual(get_catalog_version(), 0)
+        course.refresh_from_db()
+        self.assertEqual(course.content_version, 3)
+
+    def test_publish_edit_and_unpublish_bump_the_catalog_version(self):
+        course = Course(instructor=self.instructor, title="Course", description="About")
+        self.save(course)
+
+        course.is_published = True
+        self.save(course)
+        self.assertEqual(get_catalog_version(), 1)
+        self.assertTrue(CourseCatalogEntry.objects.filter(course=course).exists())
+
+        self.save(Section(course=course, title="Intro", order=1))
+        self.assertEqual(get_catalog_version(), 2)
+
+        course.is_published = False
+        self.save(course)
+        self.assertEqual(get_catalog_version(), 3)
+        self.assertFalse(CourseCatalogEntry.objects.filter(course=course).exists())
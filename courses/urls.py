@@ -5,6 +5,7 @@ from .views import (
     InstructorCourseListCreateAPIView,
     PublicCourseDetailAPIView,
     PublicCourseListAPIView,
+    PublicCourseSearchAPIView,
     InstructorSectionListCreateAPIView,
     CourseCompletionAPIView,
 )
@@ -35,6 +36,11 @@ urlpatterns = [
         PublicCourseListAPIView.as_view(),
         name="public-courses",
     ),
+    path(
+        "public/courses/search/",
+        PublicCourseSearchAPIView.as_view(),
+        name="public-course-search",
+    ),
     path(
         "public/courses/<int:pk>/",
         PublicCourseDetailAPIView.as_view(),
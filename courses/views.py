@@ -4,11 +4,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Value
 from django.shortcuts import get_object_or_404
+from academy.pagination import CreatedAtCursorPagination
 from lessons.models import Lesson
 from .models import Course, Section
-from .serializers import InstructorCourseSerializer, PublicCourseSerializer
+from .serializers import InstructorCourseSerializer, CourseCatalogSerializer
 from .permissions import IsInstructor, IsCourseOwner
+from .catalog import LIVE_FIELDS, get_catalog_version
+from .search import search_course_ids
+from .filters import PublicCourseFilter
+from .mixins import CourseConditionalGetMixin
+from academy.conditional import ConditionalGetMixin
 
 
 class InstructorCourseListCreateAPIView(generics.ListCreateAPIView):
@@ -52,29 +59,104 @@ class CoursePublishAPIView(APIView):
             raise PermissionDenied("Course must have at least one published lesson.")
 
         course.is_published = True
-        course.save()
+        course.save(update_fields=["is_published", "updated_at"])
 
         return Response({"detail": "Course published."}, status=status.HTTP_200_OK)
 
 
-class PublicCourseListAPIView(generics.ListAPIView):
-    queryset = Course.objects.filter(is_published=True).select_related(
-        "instructor__user"
-    ).prefetch_related(
-        "sections",
-        "sections__lessons"
-    )
-    serializer_class = PublicCourseSerializer
+class PublicCourseListAPIView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Payloads are prebuilt in CourseCatalogEntry (see courses.catalog), so a
+    page is served from a single joined query. ``?view=summary`` returns only
+    the card fields and never reads the section/lesson tree. Filters are in
+    PublicCourseFilter; every sort is backed by an index on Course.
+    """
+
+    serializer_class = CourseCatalogSerializer
+    pagination_class = CreatedAtCursorPagination
+    filterset_class = PublicCourseFilter
+    ordering_fields = ["created_at", "average_rating", "reviews_count", "price"]
+    ordering = ["-created_at", "-id"]
+
+    def is_summary(self):
+        return self.request.query_params.get("view") == "summary"
 
+    def get_validator_state(self):
+        return get_catalog_version()
 
-class PublicCourseDetailAPIView(generics.RetrieveAPIView):
-    queryset = Course.objects.filter(is_published=True).select_related(
-        "instructor__user"
-    ).prefetch_related(
-        "sections",
-        "sections__lessons"
+    def get_queryset(self):
+        payload_field = "summary" if self.is_summary() else "payload"
+        return (
+            # Compared as "is_published = true": SQLite cannot match a bare
+            # boolean column against the (is_published, ...) sort indexes
+            Course.objects.filter(is_published=Value(True))
+            .select_related("catalog_entry")
+            .only(
+                "id",
+                "created_at",
+                "price",
+                *LIVE_FIELDS,
+                f"catalog_entry__{payload_field}",
+            )
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["summary"] = self.is_summary()
+        return context
+
+
+class PublicCourseSearchAPIView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Full-text search over published courses: ``?q=`` matches every word as a
+    prefix of the title, instructor name, description, section or lesson
+    titles. Returns up to ``?limit=`` summaries, best match first.
+    """
+
+    serializer_class = CourseCatalogSerializer
+    pagination_class = None
+    # Results are ordered by relevance
+    filter_backends = []
+    default_limit = 20
+    max_limit = 50
+
+    def get_validator_state(self):
+        return get_catalog_version()
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        course_ids = search_course_ids(
+            self.request.query_params.get("q", ""), self.get_limit()
+        )
+        courses = (
+            Course.objects.filter(pk__in=course_ids, is_published=True)
+            .select_related("catalog_entry")
+            .only("id", *LIVE_FIELDS, "catalog_entry__summary")
+            .in_bulk()
+        )
+        return [courses[pk] for pk in course_ids if pk in courses]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["summary"] = True
+        return context
+
+
+class PublicCourseDetailAPIView(CourseConditionalGetMixin, generics.RetrieveAPIView):
+    course_url_kwarg = "pk"
+    published_only = True
+    queryset = (
+        Course.objects.filter(is_published=True)
+        .select_related("catalog_entry")
+        .only("id", *LIVE_FIELDS, "catalog_entry__payload")
     )
-    serializer_class = PublicCourseSerializer
+    serializer_class = CourseCatalogSerializer
 
 
 class InstructorSectionListCreateAPIView(generics.ListCreateAPIView):
@@ -101,32 +183,15 @@ class CourseCompletionAPIView(APIView):
 
     def get(self, request, course_id):
         from enrollments.models import Enrollment
-        from lessons.models import LessonProgress
-        
-        # Verify enrollment
-        enrollment = get_object_or_404(Enrollment, student=request.user, course_id=course_id)
-        
-        # Get all published lessons in the course
-        total_lessons = Lesson.objects.filter(
-            section__course_id=course_id,
-            is_published=True
-        ).count()
-        
-        if total_lessons == 0:
-            return Response({"completion_percentage": 0, "completed_lessons": 0, "total_lessons": 0})
-        
-        # Get completed lessons
-        completed_lessons = LessonProgress.objects.filter(
-            user=request.user,
-            lesson__section__course_id=course_id,
-            lesson__is_published=True,
-            is_completed=True
-        ).count()
-        
-        completion_percentage = round((completed_lessons / total_lessons) * 100, 2)
-        
-        return Response({
-            "completion_percentage": completion_percentage,
-            "completed_lessons": completed_lessons,
-            "total_lessons": total_lessons
-        })
+        from lessons.utils import course_completion
+
+        # Verify enrollment and read the cached counters in one query
+        enrollment = get_object_or_404(
+            Enrollment.objects.select_related("course").only(
+                "course", "completed_lessons_count", "course__published_lessons_count"
+            ),
+            student=request.user,
+            course_id=course_id,
+        )
+
+        return Response(course_completion(enrollment))
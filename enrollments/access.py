@@ -0,0 +1,88 @@
+import uuid
+from django.core.cache import cache
+from .models import Enrollment
+
+# Enrollments are invalidated explicitly (see enrollments.signals); the
+# timeout only bounds how long a missed invalidation can linger.
+ENROLLED_COURSES_TIMEOUT = 60 * 15
+
+
+def _enrolled_courses_key(user_id):
+    return f"enrollments:course_ids:{user_id}"
+
+
+def _generation_key(user_id):
+    return f"enrollments:generation:{user_id}"
+
+
+def _current_generation(user_id):
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, ENROLLED_COURSES_TIMEOUT)
+        generation = cache.get(key)
+    return generation
+
+
+def _load_enrolled_course_ids(user):
+    # The cached set is stored with the generation read before the query.
+    # An invalidation committing in between replaces the generation, so a
+    # set loaded just before an unenroll is never served afterwards.
+    generation = _current_generation(user.pk)
+    course_ids = frozenset(
+        Enrollment.objects.filter(student_id=user.pk).values_list(
+            "course_id", flat=True
+        )
+    )
+    cache.set(
+        _enrolled_courses_key(user.pk),
+        (generation, course_ids),
+        ENROLLED_COURSES_TIMEOUT,
+    )
+    user._enrolled_course_ids = course_ids
+    return course_ids
+
+
+def get_enrolled_course_ids(user, refresh=False):
+    """
+    Return the IDs of the courses ``user`` is enrolled in.
+    Memoized on the user object for the request and cached per user.
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+
+    if refresh:
+        return _load_enrolled_course_ids(user)
+
+    course_ids = getattr(user, "_enrolled_course_ids", None)
+    if course_ids is not None:
+        return course_ids
+
+    key, generation_key = _enrolled_courses_key(user.pk), _generation_key(user.pk)
+    cached = cache.get_many([key, generation_key])
+    generation, course_ids = cached.get(key, (None, None))
+    if generation is None or generation != cached.get(generation_key):
+        return _load_enrolled_course_ids(user)
+
+    user._enrolled_course_ids = course_ids
+    return course_ids
+
+
+def is_enrolled(user, course_id):
+    """
+    Enrolled users are answered from the cache. A miss is confirmed against
+    the database, because the cached set may predate an enrollment made
+    through another process.
+    """
+    course_id = int(course_id)
+
+    if course_id in get_enrolled_course_ids(user):
+        return True
+
+    return course_id in get_enrolled_course_ids(user, refresh=True)
+
+
+def invalidate_enrolled_courses(user_id):
+    # A new generation, never a reused one, so no set loaded before this can
+    # match it again. Once it expires every cached set is reloaded.
+    cache.set(_generation_key(user_id), uuid.uuid4().hex, ENROLLED_COURSES_TIMEOUT)
@@ -11,10 +11,15 @@ class Enrollment(models.Model):
         Course, on_delete=models.CASCADE, related_name="enrollments"
     )
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # Completed published lessons, maintained by lessons.utils
+    completed_lessons_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ("student", "course")
-        ordering = ["-enrolled_at"]
+        ordering = ["-enrolled_at", "-id"]
+        indexes = [
+            models.Index(fields=["student", "-enrolled_at", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.student.email} → {self.course.title}"
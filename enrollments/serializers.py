@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from courses.serializers import PublicCourseSummarySerializer
+from lessons.utils import course_completion
 from .models import Enrollment
 
 
@@ -11,3 +13,20 @@ class EnrollmentSerializer(serializers.ModelSerializer):
             "enrolled_at",
         ]
         read_only_fields = ["id", "enrolled_at"]
+
+
+class EnrollmentDashboardSerializer(serializers.ModelSerializer):
+    course = PublicCourseSummarySerializer(read_only=True)
+    completion = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Enrollment
+        fields = [
+            "id",
+            "course",
+            "enrolled_at",
+            "completion",
+        ]
+
+    def get_completion(self, obj):
+        return course_completion(obj)
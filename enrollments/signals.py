@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .access import invalidate_enrolled_courses
+from .models import Enrollment
+
+
+@receiver(post_save, sender=Enrollment)
+def invalidate_access_on_enroll(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: invalidate_enrolled_courses(instance.student_id))
+
+
+@receiver(post_delete, sender=Enrollment)
+def invalidate_access_on_unenroll(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_enrolled_courses(instance.student_id))
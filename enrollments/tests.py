@@ -1,3 +1,60 @@
-from django.test import TestCase
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from courses.models import Course
+from users.models import InstructorProfile, User
+from . import access
+from .models import Enrollment
 
-# Create your tests here.
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class EnrolledCoursesCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        instructor = InstructorProfile.objects.create(
+            user=User.objects.create_user(
+                email="instructor@example.com", username="instructor"
+            )
+        )
+        self.course = Course.objects.create(
+            instructor=instructor, title="Course", description="About"
+        )
+        self.student = User.objects.create_user(
+            email="student@example.com", username="student"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment = Enrollment.objects.create(
+                student=self.student, course=self.course
+            )
+
+    def fresh_student(self):
+        return User.objects.get(pk=self.student.pk)
+
+    def unenroll(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.enrollment.delete()
+
+    def test_unenroll_invalidates_the_cached_set(self):
+        self.assertTrue(access.is_enrolled(self.fresh_student(), self.course.pk))
+        self.unenroll()
+        self.assertFalse(access.is_enrolled(self.fresh_student(), self.course.pk))
+
+    def test_set_loaded_before_an_unenroll_is_not_served_after_it(self):
+        test = self
+
+        class UnenrollBeforeWrite:
+            # The unenroll commits after the set was read, before it is cached
+            def __getattr__(self, name):
+                return getattr(cache, name)
+
+            def set(self, key, value, timeout=None):
+                if key.startswith("enrollments:course_ids:"):
+                    test.unenroll()
+                cache.set(key, value, timeout)
+
+        with mock.patch.object(access, "cache", UnenrollBeforeWrite()):
+            self.assertIn(self.course.pk, access.get_enrolled_course_ids(self.fresh_student()))
+
+        self.assertFalse(access.is_enrolled(self.fresh_student(), self.course.pk))
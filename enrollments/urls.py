@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import StudentEnrollmentListCreateAPIView
+from .views import StudentEnrollmentListCreateAPIView, StudentDashboardAPIView
 
 urlpatterns = [
     path(
@@ -7,4 +7,9 @@ urlpatterns = [
         StudentEnrollmentListCreateAPIView.as_view(),
         name="student-enrollments",
     ),
+    path(
+        "student/dashboard/",
+        StudentDashboardAPIView.as_view(),
+        name="student-dashboard",
+    ),
 ]
@@ -1,8 +1,9 @@
 from rest_framework import generics
 from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
+from academy.pagination import EnrolledAtCursorPagination
 from .models import Enrollment
-from .serializers import EnrollmentSerializer
+from .serializers import EnrollmentSerializer, EnrollmentDashboardSerializer
 from .permissions import IsStudent
 from courses.models import Course
 
@@ -10,6 +11,9 @@ from courses.models import Course
 class StudentEnrollmentListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = EnrollmentSerializer
     permission_classes = [IsStudent]
+    pagination_class = EnrolledAtCursorPagination
+    ordering_fields = ["enrolled_at"]
+    ordering = ["-enrolled_at", "-id"]
 
     def get_queryset(self):
         return Enrollment.objects.filter(student=self.request.user)
@@ -25,3 +29,19 @@ class StudentEnrollmentListCreateAPIView(generics.ListCreateAPIView):
             raise PermissionDenied("Instructor cannot enroll in own course.")
 
         serializer.save(student=self.request.user, course=course)
+
+
+class StudentDashboardAPIView(generics.ListAPIView):
+    """
+    Every enrollment of the student with its course summary and completion,
+    read from the cached progress counters in a single query.
+    """
+
+    serializer_class = EnrollmentDashboardSerializer
+    permission_classes = [IsStudent]
+    pagination_class = None
+
+    def get_queryset(self):
+        return Enrollment.objects.filter(student=self.request.user).select_related(
+            "course", "course__instructor__user"
+        )
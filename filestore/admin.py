@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import StoredFile
+
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ("name", "ref_count", "created_at")
+    search_fields = ("name",)
+    readonly_fields = ("name", "ref_count", "created_at")
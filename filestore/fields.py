@@ -0,0 +1,91 @@
+from collections import Counter
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_save, pre_save
+from .references import REFERENCING_FIELDS, acquire, release
+from .storage import content_addressed_storage
+
+
+class ContentAddressedFieldFile(FieldFile):
+    def save(self, name, content, save=True):
+        super().save(name, content, save=False)
+        # The storage took a reference for this upload; the field accounts for it
+        self.field._uploaded_names(self.instance)[self.field.attname] = self.name
+        if save:
+            self.instance.save()
+
+
+class ContentAddressedFileField(models.FileField):
+    """
+    FileField stored in ContentAddressedStorage whose files are reference
+    counted: duplicate uploads become metadata-only inserts, and a file is
+    deleted only when the last row referencing it is deleted.
+    """
+
+    attr_class = ContentAddressedFieldFile
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("storage", content_addressed_storage)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get("storage") is content_addressed_storage:
+            del kwargs["storage"]
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if cls._meta.abstract:
+            return
+
+        REFERENCING_FIELDS.append((cls, self))
+        pre_save.connect(self._remember_previous_name, sender=cls, weak=False)
+        post_save.connect(self._update_references, sender=cls, weak=False)
+        post_delete.connect(self._release_reference, sender=cls, weak=False)
+
+    def _previous_names(self, instance):
+        if not hasattr(instance, "_content_addressed_previous"):
+            instance._content_addressed_previous = {}
+        return instance._content_addressed_previous
+
+    def _uploaded_names(self, instance):
+        if not hasattr(instance, "_content_addressed_uploaded"):
+            instance._content_addressed_uploaded = {}
+        return instance._content_addressed_uploaded
+
+    def _remember_previous_name(self, sender, instance, raw=False, **kwargs):
+        previous = None
+        if not instance._state.adding and instance.pk is not None:
+            previous = (
+                sender._base_manager.filter(pk=instance.pk)
+                .values_list(self.attname, flat=True)
+                .first()
+            )
+        self._previous_names(instance)[self.attname] = previous or None
+
+    def _update_references(self, sender, instance, raw=False, **kwargs):
+        previous = self._previous_names(instance).pop(self.attname, None)
+        uploaded = self._uploaded_names(instance).pop(self.attname, None)
+        current = getattr(instance, self.attname).name or None
+
+        # The row holds one reference to its current file and none to the
+        # previous one; an upload already added one when it was stored
+        deltas = Counter()
+        if current:
+            deltas[current] += 1
+        if previous:
+            deltas[previous] -= 1
+        if uploaded:
+            deltas[uploaded] -= 1
+
+        for name, delta in deltas.items():
+            if delta > 0:
+                acquire(name, delta)
+            elif delta < 0:
+                release(name, self.storage, -delta)
+
+    def _release_reference(self, sender, instance, **kwargs):
+        current = getattr(instance, self.attname).name
+        if current:
+            release(current, self.storage)
@@ -0,0 +1,44 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from filestore.models import StoredFile
+from filestore.references import REFERENCING_FIELDS
+from filestore.storage import is_content_addressed
+
+
+class Command(BaseCommand):
+    help = "Recount references to content-addressed files from the referencing rows."
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        counts = Counter()
+        for model, field in REFERENCING_FIELDS:
+            names = (
+                model._base_manager.exclude(**{field.attname: ""})
+                .values_list(field.attname, flat=True)
+                .iterator()
+            )
+            counts.update(name for name in names if is_content_addressed(name))
+
+        orphans = StoredFile.objects.exclude(name__in=list(counts))
+        orphaned = orphans.count()
+        # Orphaned files are left on disk; only the bookkeeping is corrected
+        orphans.delete()
+
+        existing = {f.name: f for f in StoredFile.objects.all()}
+        changed = []
+        for name, count in counts.items():
+            stored = existing.get(name)
+            if stored is None:
+                changed.append(StoredFile(name=name, ref_count=count))
+            elif stored.ref_count != count:
+                stored.ref_count = count
+                stored.save(update_fields=["ref_count"])
+
+        StoredFile.objects.bulk_create(changed)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Tracked {len(counts)} files, dropped {orphaned} stale entries."
+            )
+        )
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class StoredFile(models.Model):
+    """
+    Reference count of a content-addressed file. The file is deleted from
+    storage when the last row pointing at it is deleted.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
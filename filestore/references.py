@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models import F
+from .models import StoredFile
+from .storage import is_content_addressed
+
+# (model, field) pairs using ContentAddressedFileField, filled in as models load
+REFERENCING_FIELDS = []
+
+
+def acquire(name, count=1):
+    """
+    Add ``count`` references to a stored file, creating its row if needed.
+    Taken before the file is written or reused (see ContentAddressedStorage),
+    so the garbage collection below can never remove content in use.
+    """
+    if not is_content_addressed(name):
+        return
+
+    # The UPDATE waits on a collection in progress for the same row; when
+    # that removed the row (and file), it is recreated and the file rewritten
+    updated = StoredFile.objects.filter(name=name).update(ref_count=F("ref_count") + count)
+    if not updated:
+        _, created = StoredFile.objects.get_or_create(
+            name=name, defaults={"ref_count": count}
+        )
+        if not created:
+            StoredFile.objects.filter(name=name).update(ref_count=F("ref_count") + count)
+
+
+def release(name, storage, count=1):
+    if not is_content_addressed(name):
+        return
+
+    StoredFile.objects.filter(name=name).update(ref_count=F("ref_count") - count)
+    if StoredFile.objects.filter(name=name, ref_count__lte=0).exists():
+        transaction.on_commit(lambda: _delete_unreferenced(name, storage))
+
+
+def _delete_unreferenced(name, storage):
+    with transaction.atomic():
+        # Deleting the row only while it is unreferenced locks it against a
+        # concurrent acquire() until the file is gone as well
+        deleted, _ = StoredFile.objects.filter(name=name, ref_count__lte=0).delete()
+        if deleted:
+            storage.delete(name)
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import posixpath
+import re
+import uuid
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+CONTENT_ADDRESSED_NAME = re.compile(r"(^|/)[0-9a-f]{2}/[0-9a-f]{64}(\.[^/]*)?$")
+
+
+def file_sha256(content):
+    """SHA-256 of a file, read chunk by chunk."""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+def is_content_addressed(name):
+    return bool(name) and CONTENT_ADDRESSED_NAME.search(name) is not None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names every file after the SHA-256 of its
+    content, inside the directory the field's ``upload_to`` selects. Saving
+    content that is already stored writes nothing and returns the existing
+    name. The digest is taken from ``content.content_hash`` when an upload
+    handler already computed it.
+
+    Every save takes one reference to the returned name (filestore.references)
+    before the file is checked or written; the caller owns that reference.
+    """
+
+    def hashed_name(self, digest, name):
+        directory = posixpath.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], f"{digest}{ext}")
+
+    def get_available_name(self, name, max_length=None):
+        # A file already stored under this name holds the same content
+        return name
+
+    def content_name(self, name, content):
+        """Name the content would be stored under, from the ``upload_to`` name."""
+        digest = getattr(content, "content_hash", None) or file_sha256(content)
+        return self.hashed_name(digest, name)
+
+    def save(self, name, content, max_length=None):
+        from .references import acquire
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = self.content_name(name, content)
+        acquire(name)
+        return self.store(name, content, max_length=max_length)
+
+    def store(self, name, content, max_length=None):
+        """
+        Write content under its content name unless it is already there. The
+        caller must hold a reference to ``name``, which save() takes itself.
+        """
+        if self.exists(name):
+            return name
+
+        return super().save(name, content, max_length=max_length)
+
+    def _save(self, name, content):
+        # Write under a temporary name and rename into place, so a file is
+        # never seen half written and a concurrent upload of the same
+        # content just replaces it with identical bytes
+        directory, basename = posixpath.split(name)
+        temp_name = posixpath.join(directory, f".{basename}.{uuid.uuid4().hex}.tmp")
+        try:
+            super()._save(temp_name, content)
+            os.replace(self.path(temp_name), self.path(name))
+        except BaseException:
+            # Don't leave a partly written temporary file behind
+            try:
+                os.remove(self.path(temp_name))
+            except FileNotFoundError:
+                pass
+            raise
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from lessons.models import Lesson, LessonResource
+from .models import StoredFile
+from .storage import content_addressed_storage as storage
+
+
+class ContentAddressedReferenceTests(TestCase):
+    """Rows share stored content, and the last one to let go deletes it."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.lesson = Lesson.objects.create(title="Lesson", order=1)
+
+    def resource(self, content, title="Slides"):
+        resource = LessonResource(lesson=self.lesson, title=title)
+        resource.file.save("slides.pdf", ContentFile(content))
+        return resource
+
+    def ref_count(self, name):
+        return StoredFile.objects.filter(name=name).values_list("ref_count", flat=True).first()
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.resource(b"same bytes")
+        second = self.resource(b"same bytes", title="Copy")
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(storage.exists(first.file.name))
+        self.assertEqual(self.ref_count(first.file.name), 2)
+
+    def test_last_delete_removes_the_file(self):
+        first = self.resource(b"same bytes")
+        second = self.resource(b"same bytes", title="Copy")
+        name = first.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.ref_count(name), 1)
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertIsNone(self.ref_count(name))
+        self.assertFalse(storage.exists(name))
+
+    def test_replacing_the_file_releases_the_old_content(self):
+        resource = self.resource(b"old bytes")
+        old_name = resource.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.file.save("slides.pdf", ContentFile(b"new bytes"))
+
+        self.assertIsNone(self.ref_count(old_name))
+        self.assertFalse(storage.exists(old_name))
+        self.assertEqual(self.ref_count(resource.file.name), 1)
+
+    def test_saving_the_row_again_keeps_one_reference(self):
+        resource = self.resource(b"bytes")
+        resource.title = "Renamed"
+        resource.save()
+
+        self.assertEqual(self.ref_count(resource.file.name), 1)
+
+    def test_file_is_kept_when_reacquired_before_collection(self):
+        resource = self.resource(b"bytes")
+        name = resource.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.delete()
+            # Uploaded again before the delete committed
+            again = self.resource(b"bytes", title="Again")
+
+        self.assertEqual(again.file.name, name)
+        self.assertEqual(self.ref_count(name), 1)
+        self.assertTrue(storage.exists(name))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from lessons.utils import recompute_lesson_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute published lesson totals and per-enrollment completion counters."
+
+    def handle(self, *args, **options):
+        courses, enrollments = recompute_lesson_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled {courses} courses and {enrollments} enrollments."
+            )
+        )
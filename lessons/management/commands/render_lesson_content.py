@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from lessons.models import Lesson
+from lessons.rendering import RENDERED_FIELDS, render_lesson
+
+
+class Command(BaseCommand):
+    help = "Render lesson Markdown whose content or renderer version changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--force", action="store_true", help="Re-render every lesson."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        lessons = Lesson.objects.only("id", "content", *RENDERED_FIELDS).order_by("id")
+
+        rendered = 0
+        batch = []
+        for lesson in lessons.iterator(chunk_size=batch_size):
+            if render_lesson(lesson, force=options["force"]):
+                batch.append(lesson)
+            if len(batch) >= batch_size:
+                Lesson.objects.bulk_update(batch, RENDERED_FIELDS)
+                rendered += len(batch)
+                batch = []
+
+        if batch:
+            Lesson.objects.bulk_update(batch, RENDERED_FIELDS)
+            rendered += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} lessons."))
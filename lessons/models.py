@@ -1,6 +1,8 @@
 from django.db import models
 from courses.models import Course, Section
+from filestore.fields import ContentAddressedFileField
 from users.models import User
+from .rendering import RENDERED_FIELDS, render_lesson
 
 
 class Lesson(models.Model):
@@ -9,10 +11,13 @@ class Lesson(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     content = models.TextField(blank=True, help_text="Markdown content")
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+    content_render_version = models.PositiveSmallIntegerField(default=0, editable=False)
     
     # Media
     video_url = models.URLField(blank=True, null=True, help_text="YouTube/Vimeo URL")
-    video_file = models.FileField(upload_to="lessons/videos/", blank=True, null=True)
+    video_file = ContentAddressedFileField(upload_to="lessons/videos/", blank=True, null=True)
     duration = models.DurationField(blank=True, null=True, help_text="Duration of the lesson")
     
     order = models.PositiveIntegerField()
@@ -28,11 +33,18 @@ class Lesson(models.Model):
     def __str__(self):
         return f"{self.order}. {self.title}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            if render_lesson(self) and update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *RENDERED_FIELDS}
+        super().save(*args, **kwargs)
+
 
 class LessonResource(models.Model):
     lesson = models.ForeignKey(Lesson, on_delete=models.CASCADE, related_name="resources")
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to="lessons/resources/")
+    file = ContentAddressedFileField(upload_to="lessons/resources/")
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
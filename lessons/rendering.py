@@ -0,0 +1,40 @@
+import hashlib
+import markdown
+import nh3
+
+# Bump when the Markdown extensions or sanitizer rules change; the
+# render_lesson_content command then re-renders every lesson.
+RENDER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+
+RENDERED_FIELDS = ["content_html", "content_hash", "content_render_version"]
+
+
+def hash_content(content):
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def render_markdown(content):
+    """Render lesson Markdown to HTML that is safe to embed in a page."""
+    html = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+    return nh3.clean(html, link_rel="noopener noreferrer nofollow")
+
+
+def render_lesson(lesson, force=False):
+    """
+    Refresh the cached rendering of a lesson when its content or the
+    renderer changed. Returns True when the lesson was re-rendered.
+    """
+    content_hash = hash_content(lesson.content)
+    if (
+        not force
+        and lesson.content_hash == content_hash
+        and lesson.content_render_version == RENDER_VERSION
+    ):
+        return False
+
+    lesson.content_html = render_markdown(lesson.content)
+    lesson.content_hash = content_hash
+    lesson.content_render_version = RENDER_VERSION
+    return True
@@ -1,8 +1,29 @@
 from rest_framework import serializers
-from .models import Lesson, LessonProgress
+from academy.media import signed_media_url
+from .models import Lesson, LessonProgress, LessonResource
+
+
+def _signed_file_url(file, context):
+    if not file:
+        return None
+    return signed_media_url(file.name, context.get("request"))
+
+
+class LessonResourceSerializer(serializers.ModelSerializer):
+    file_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LessonResource
+        fields = ["id", "title", "file_url"]
+
+    def get_file_url(self, obj):
+        return _signed_file_url(obj.file, self.context)
 
 
 class LessonSerializer(serializers.ModelSerializer):
+    video_file_url = serializers.SerializerMethodField()
+    resources = LessonResourceSerializer(many=True, read_only=True)
+
     class Meta:
         model = Lesson
         fields = [
@@ -10,6 +31,12 @@ class LessonSerializer(serializers.ModelSerializer):
             "section",
             "title",
             "content",
+            "content_html",
+            "content_hash",
+            "video_url",
+            "video_file_url",
+            "resources",
+            "duration",
             "order",
             "is_published",
             "created_at",
@@ -17,10 +44,35 @@ class LessonSerializer(serializers.ModelSerializer):
 
         read_only_fields = [
             "id",
+            "content_html",
+            "content_hash",
             "is_published",
             "created_at",
         ]
 
+    def validate_section(self, section):
+        # Lessons may only be placed in sections of the course in the URL
+        view = self.context.get("view")
+        course_id = view.kwargs.get("course_id") if view is not None else None
+        if section is not None and course_id is not None and section.course_id != course_id:
+            raise serializers.ValidationError("Section does not belong to this course.")
+        # Published lessons count towards their section's course totals
+        if section is None and self.instance is not None and self.instance.is_published:
+            raise serializers.ValidationError("Published lessons must belong to a section.")
+        return section
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Clients that already hold the current body only need the metadata
+        known_hash = self.context.get("known_content_hash")
+        if known_hash and known_hash == instance.content_hash:
+            del data["content"], data["content_html"]
+        return data
+
+    def get_video_file_url(self, obj):
+        # Media links are signed so the file server never checks enrollment again
+        return _signed_file_url(obj.video_file, self.context)
+
 
 class StudentLessonSerializer(serializers.ModelSerializer):
     class Meta:
@@ -38,3 +90,16 @@ class LessonProgressSerializer(serializers.ModelSerializer):
         fields = ["is_completed", "completed_at"]
         read_only_fields = ["completed_at"]
 
+
+class LessonProgressSyncItemSerializer(serializers.Serializer):
+    lesson_id = serializers.IntegerField()
+    is_completed = serializers.BooleanField()
+    timestamp = serializers.DateTimeField()
+
+
+class LessonProgressSyncSerializer(serializers.Serializer):
+    items = serializers.ListField(
+        child=LessonProgressSyncItemSerializer(),
+        allow_empty=False,
+        max_length=500,
+    )
@@ -1,3 +1,337 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from django.utils import timezone
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from academy.media import UnsatisfiableRange, parse_byte_range, serve_file
+from courses.models import Course, Section
+from enrollments.models import Enrollment
+from users.models import InstructorProfile, User
+from .models import Lesson, LessonProgress
+from .utils import recompute_lesson_counters
+from .views import LessonVideoAPIView
 
-# Create your tests here.
+
+class ParseByteRangeTests(SimpleTestCase):
+    def test_single_range(self):
+        self.assertEqual(parse_byte_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_byte_range("bytes=500-", 1000), (500, 999))
+
+    def test_end_is_clamped_to_the_file(self):
+        self.assertEqual(parse_byte_range("bytes=900-5000", 1000), (900, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_byte_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_byte_range("bytes=-5000", 1000), (0, 999))
+
+    def test_unsatisfiable_range(self):
+        for header in ("bytes=1000-", "bytes=-0"):
+            with self.subTest(header=header):
+                with self.assertRaises(UnsatisfiableRange):
+                    parse_byte_range(header, 1000)
+
+    def test_ignored_ranges(self):
+        for header in ("bytes=0-1,5-9", "items=0-9", "bytes=-", "bytes=9-0"):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_byte_range(header, 1000))
+
+
+class ServeFileTests(SimpleTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.storage = FileSystemStorage(location=location)
+        self.content = bytes(range(256)) * 4
+        self.name = self.storage.save("video.mp4", ContentFile(self.content))
+        self.factory = APIRequestFactory()
+
+    def serve(self, **headers):
+        request = self.factory.get("/", headers=headers)
+        return serve_file(request, self.storage, self.name)
+
+    def test_whole_file(self):
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        response.close()
+
+    def test_single_range_is_partial_content(self):
+        response = self.serve(Range="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/1024")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+
+    def test_suffix_range_is_partial_content(self):
+        response = self.serve(Range="bytes=-24")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 1000-1023/1024")
+        self.assertEqual(b"".join(response.streaming_content), self.content[-24:])
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(Range="bytes=2048-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        response = self.serve(Range="bytes=10-19", If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    @override_settings(MEDIA_OFFLOAD="X-Accel-Redirect", MEDIA_ACCEL_REDIRECT_PREFIX="/protected/")
+    def test_accel_redirect_offload(self):
+        response = self.serve(Range="bytes=10-19")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.name}")
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(response.content, b"")
+
+    @override_settings(MEDIA_OFFLOAD="x-sendfile")
+    def test_sendfile_offload(self):
+        response = self.serve()
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.storage.location, self.name))
+        self.assertEqual(response.content, b"")
+
+
+class LessonVideoThrottleTests(SimpleTestCase):
+    def test_video_requests_are_not_throttled(self):
+        # Seeking sends a Range request per jump
+        self.assertEqual(LessonVideoAPIView().get_throttles(), [])
+
+
+class CourseLessonsMixin:
+    """An instructor's course with two sections and three draft lessons."""
+
+    def setUp(self):
+        self.instructor_user = User.objects.create_user(
+            email="instructor@example.com",
+            username="instructor",
+            role=User.ROLE_INSTRUCTOR,
+        )
+        instructor = InstructorProfile.objects.create(
+            user=self.instructor_user, is_verified=True
+        )
+        self.course = Course.objects.create(
+            instructor=instructor, title="Course", description="About"
+        )
+        self.intro = Section.objects.create(course=self.course, title="Intro", order=1)
+        self.advanced = Section.objects.create(course=self.course, title="Advanced", order=2)
+        self.lessons = [
+            Lesson.objects.create(
+                section=self.intro,
+                title=f"Lesson {i}",
+                order=i,
+                duration=timedelta(minutes=10 * i),
+            )
+            for i in range(1, 4)
+        ]
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.instructor_user)
+        self.base_url = f"/api/lessons/instructor/courses/{self.course.pk}/lessons"
+
+    def publish(self, lesson):
+        response = self.client.post(f"{self.base_url}/{lesson.pk}/publish/")
+        self.assertEqual(response.status_code, 200)
+
+
+class PublishedTotalsTests(CourseLessonsMixin, TestCase):
+    """The incremental totals must match what recompute_lesson_counters finds."""
+
+    def totals(self):
+        return [
+            (obj.published_lessons_count, obj.published_duration)
+            for obj in (
+                Course.objects.get(pk=self.course.pk),
+                Section.objects.get(pk=self.intro.pk),
+                Section.objects.get(pk=self.advanced.pk),
+            )
+        ]
+
+    def assertTotalsMatchRecompute(self):
+        incremental = self.totals()
+        self.assertEqual(recompute_lesson_counters(), (0, 0))
+        self.assertEqual(self.totals(), incremental)
+
+    def test_publish_edit_move_and_delete(self):
+        first, second, third = self.lessons
+        for lesson in self.lessons:
+            self.publish(lesson)
+        self.assertEqual(self.totals()[0], (3, timedelta(minutes=60)))
+        self.assertTotalsMatchRecompute()
+
+        response = self.client.patch(
+            f"{self.base_url}/{second.pk}/",
+            {"section": self.advanced.pk, "duration": "00:25:00"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.totals()[2], (1, timedelta(minutes=25)))
+        self.assertTotalsMatchRecompute()
+
+        response = self.client.delete(f"{self.base_url}/{first.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.totals()[0], (2, timedelta(minutes=55)))
+        self.assertTotalsMatchRecompute()
+
+    def test_published_lesson_cannot_leave_its_section(self):
+        lesson = self.lessons[0]
+        self.publish(lesson)
+
+        response = self.client.patch(
+            f"{self.base_url}/{lesson.pk}/", {"section": None}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertTotalsMatchRecompute()
+
+        # Drafts may still be taken out of their section
+        response = self.client.patch(
+            f"{self.base_url}/{self.lessons[1].pk}/", {"section": None}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTotalsMatchRecompute()
+
+
+class StudentProgressMixin(CourseLessonsMixin):
+    """Adds an enrolled student to CourseLessonsMixin."""
+
+    def setUp(self):
+        super().setUp()
+        self.student = User.objects.create_user(
+            email="student@example.com", username="student"
+        )
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+        self.student_client = APIClient()
+        self.student_client.force_authenticate(self.student)
+        self.student_url = f"/api/lessons/student/courses/{self.course.pk}/lessons"
+
+    def set_completed(self, lesson, is_completed):
+        response = self.student_client.patch(
+            f"{self.student_url}/{lesson.pk}/progress/", {"is_completed": is_completed}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def completion(self):
+        response = self.student_client.get(
+            f"/api/courses/student/courses/{self.course.pk}/completion/"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assertCountersMatchRecompute(self):
+        completion = self.completion()
+        self.assertEqual(recompute_lesson_counters(), (0, 0))
+        self.assertEqual(self.completion(), completion)
+
+
+class CompletedLessonsCounterTests(StudentProgressMixin, TestCase):
+    """Progress updates keep the enrollment's completed lesson count current."""
+
+    def test_completing_and_uncompleting_published_lessons(self):
+        first, second, _ = self.lessons
+        for lesson in self.lessons:
+            self.publish(lesson)
+
+        self.set_completed(first, True)
+        self.set_completed(first, True)
+        self.set_completed(second, True)
+        self.assertEqual(
+            self.completion(),
+            {"completion_percentage": 66.67, "completed_lessons": 2, "total_lessons": 3},
+        )
+        self.assertCountersMatchRecompute()
+
+        self.set_completed(second, False)
+        self.assertEqual(self.completion()["completed_lessons"], 1)
+        self.assertCountersMatchRecompute()
+
+    def test_draft_completion_counts_once_the_lesson_is_published(self):
+        first, second, _ = self.lessons
+        self.publish(first)
+        self.set_completed(second, True)
+        self.assertEqual(self.completion()["completed_lessons"], 0)
+
+        self.publish(second)
+        self.assertEqual(
+            self.completion(),
+            {"completion_percentage": 50.0, "completed_lessons": 1, "total_lessons": 2},
+        )
+        self.assertCountersMatchRecompute()
+
+    def test_deleting_a_completed_lesson(self):
+        first, second, _ = self.lessons
+        self.publish(first)
+        self.publish(second)
+        self.set_completed(first, True)
+
+        response = self.client.delete(f"{self.base_url}/{first.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            self.completion(),
+            {"completion_percentage": 0, "completed_lessons": 0, "total_lessons": 1},
+        )
+        self.assertCountersMatchRecompute()
+
+
+class ProgressSyncTests(StudentProgressMixin, TestCase):
+    """The bulk sync applies the net change to the counter in one step."""
+
+    def sync(self, items):
+        response = self.student_client.post(
+            f"/api/lessons/student/courses/{self.course.pk}/progress/sync/",
+            {"items": items},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return [result["status"] for result in response.json()["results"]]
+
+    def item(self, lesson, is_completed, minutes_ago):
+        timestamp = timezone.now() - timedelta(minutes=minutes_ago)
+        return {"lesson_id": lesson.pk, "is_completed": is_completed, "timestamp": timestamp}
+
+    def test_sync_statuses_and_counter(self):
+        first, second, third = self.lessons
+        self.publish(first)
+        self.publish(second)
+
+        statuses = self.sync(
+            [
+                self.item(first, True, 10),
+                self.item(second, False, 9),
+                # A draft lesson is stored but does not count
+                self.item(third, True, 8),
+                self.item(second, True, 7),
+                {"lesson_id": 0, "is_completed": True, "timestamp": timezone.now()},
+            ]
+        )
+        self.assertEqual(
+            statuses, ["applied", "superseded", "applied", "applied", "not_found"]
+        )
+        self.assertEqual(self.completion()["completed_lessons"], 2)
+        self.assertEqual(LessonProgress.objects.filter(is_completed=True).count(), 3)
+        self.assertCountersMatchRecompute()
+
+        statuses = self.sync(
+            [
+                self.item(first, True, 0),
+                self.item(second, False, 0),
+                # Older than the progress stored by the previous sync
+                self.item(third, False, 60),
+            ]
+        )
+        self.assertEqual(statuses, ["unchanged", "applied", "stale"])
+        self.assertEqual(self.completion()["completed_lessons"], 1)
+        self.assertCountersMatchRecompute()
+
+    def test_sync_requires_enrollment(self):
+        self.enrollment.delete()
+        response = self.student_client.post(
+            f"/api/lessons/student/courses/{self.course.pk}/progress/sync/",
+            {"items": [self.item(self.lessons[0], True, 1)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
@@ -5,7 +5,9 @@ from .views import (
     LessonPublishAPIView,
     StudentLessonDetailAPIView,
     StudentLessonListAPIView,
+    LessonVideoAPIView,
     LessonProgressUpdateAPIView,
+    LessonProgressSyncAPIView,
 )
 
 urlpatterns = [
@@ -34,9 +36,19 @@ urlpatterns = [
         StudentLessonDetailAPIView.as_view(),
         name="student-lesson-detail",
     ),
+    path(
+        "student/courses/<int:course_id>/lessons/<int:lesson_id>/video/",
+        LessonVideoAPIView.as_view(),
+        name="student-lesson-video",
+    ),
     path(
         "student/courses/<int:course_id>/lessons/<int:lesson_id>/progress/",
         LessonProgressUpdateAPIView.as_view(),
         name="student-lesson-progress",
     ),
+    path(
+        "student/courses/<int:course_id>/progress/sync/",
+        LessonProgressSyncAPIView.as_view(),
+        name="student-progress-sync",
+    ),
 ]
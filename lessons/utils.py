@@ -0,0 +1,257 @@
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import PermissionDenied
+from courses.models import Course, Section
+from enrollments.access import is_enrolled
+from enrollments.models import Enrollment
+from .models import Lesson, LessonProgress
+
+
+def get_accessible_lesson(user, course_id, lesson_id, queryset=None):
+    """
+    Return a published lesson of the course that ``user`` may open: preview
+    lessons are open to everyone, the rest only to enrolled students.
+    """
+    lesson = get_object_or_404(
+        queryset if queryset is not None else Lesson.objects.all(),
+        pk=lesson_id,
+        section__course_id=course_id,
+        is_published=True,
+    )
+
+    if not lesson.is_preview and not is_enrolled(user, course_id):
+        raise PermissionDenied("Enroll to access this lesson.")
+
+    return lesson
+
+
+def lesson_duration(lesson):
+    return lesson.duration or timedelta(0)
+
+
+def adjust_published_totals(section_id, course_id, lessons=0, duration=timedelta(0)):
+    """
+    Apply a change in published lessons/duration to a section and its course.
+    Lessons outside any section count nowhere, as in recompute_lesson_counters.
+    """
+    if section_id is None:
+        return
+
+    totals = {
+        "published_lessons_count": F("published_lessons_count") + lessons,
+        "published_duration": F("published_duration") + duration,
+    }
+    Course.objects.filter(pk=course_id).update(**totals)
+    Section.objects.filter(pk=section_id).update(**totals)
+
+
+def adjust_completed_lessons(enrollments, delta):
+    enrollments.update(completed_lessons_count=F("completed_lessons_count") + delta)
+
+
+def completed_enrollments(lesson, course_id):
+    """Enrollments of students who have completed ``lesson``."""
+    return Enrollment.objects.filter(
+        course_id=course_id,
+        student__in=LessonProgress.objects.filter(
+            lesson=lesson, is_completed=True
+        ).values("user"),
+    )
+
+
+def publish_lesson(lesson, course_id):
+    lesson.is_published = True
+    lesson.save()
+    adjust_published_totals(lesson.section_id, course_id, 1, lesson_duration(lesson))
+    adjust_completed_lessons(completed_enrollments(lesson, course_id), 1)
+
+
+def delete_lesson(lesson, course_id):
+    if lesson.is_published:
+        adjust_published_totals(
+            lesson.section_id, course_id, -1, -lesson_duration(lesson)
+        )
+        adjust_completed_lessons(completed_enrollments(lesson, course_id), -1)
+    lesson.delete()
+
+
+def update_published_totals(lesson, course_id, previous_section_id, previous_duration):
+    """
+    Carry an edit of a published lesson (new duration or section) into the
+    totals. Unpublished lessons, including newly created ones, never count.
+    ``course_id`` is the course the lesson was in; the new section's change
+    goes to that section's own course.
+    """
+    if not lesson.is_published:
+        return
+
+    new_course_id = lesson.section.course_id if lesson.section_id else course_id
+    previous_duration = previous_duration or timedelta(0)
+    if previous_section_id == lesson.section_id:
+        delta = lesson_duration(lesson) - previous_duration
+        if delta:
+            adjust_published_totals(lesson.section_id, course_id, duration=delta)
+        return
+
+    adjust_published_totals(previous_section_id, course_id, -1, -previous_duration)
+    adjust_published_totals(lesson.section_id, new_course_id, 1, lesson_duration(lesson))
+
+
+def sync_lesson_progress(enrollment, items):
+    """
+    Apply a batch of offline progress updates for one enrollment.
+
+    Items are ``{"lesson_id", "is_completed", "timestamp"}`` dicts. The latest
+    item per lesson wins, and items older than the stored progress are
+    ignored. All writes go through one upsert. Must run inside a transaction.
+    Returns one ``{"lesson_id", "status"}`` result per input item.
+    """
+    latest = {}
+    for item in sorted(items, key=lambda item: item["timestamp"]):
+        latest[item["lesson_id"]] = item
+
+    lessons = dict(
+        Lesson.objects.filter(
+            pk__in=latest, section__course_id=enrollment.course_id
+        ).values_list("id", "is_published")
+    )
+    existing = {
+        progress.lesson_id: progress
+        for progress in LessonProgress.objects.select_for_update().filter(
+            user_id=enrollment.student_id, lesson_id__in=lessons
+        )
+    }
+
+    statuses = {}
+    changes = []
+    delta = 0
+
+    for lesson_id, item in latest.items():
+        progress = existing.get(lesson_id)
+        was_completed = bool(progress and progress.is_completed)
+
+        if lesson_id not in lessons:
+            statuses[lesson_id] = "not_found"
+            continue
+        if progress is not None and progress.updated_at > item["timestamp"]:
+            statuses[lesson_id] = "stale"
+            continue
+        if was_completed == item["is_completed"]:
+            statuses[lesson_id] = "unchanged"
+            continue
+
+        if item["is_completed"]:
+            completed_at = item["timestamp"]
+        else:
+            completed_at = progress.completed_at if progress else None
+
+        changes.append(
+            LessonProgress(
+                user_id=enrollment.student_id,
+                lesson_id=lesson_id,
+                is_completed=item["is_completed"],
+                completed_at=completed_at,
+            )
+        )
+        if lessons[lesson_id]:
+            delta += 1 if item["is_completed"] else -1
+        statuses[lesson_id] = "applied"
+
+    if changes:
+        unique_fields = None
+        if connection.features.supports_update_conflicts_with_target:
+            unique_fields = ["user", "lesson"]
+
+        LessonProgress.objects.bulk_create(
+            changes,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=["is_completed", "completed_at", "updated_at"],
+        )
+
+    if delta:
+        adjust_completed_lessons(Enrollment.objects.filter(pk=enrollment.pk), delta)
+
+    return [
+        {
+            "lesson_id": item["lesson_id"],
+            "status": (
+                statuses[item["lesson_id"]]
+                if latest[item["lesson_id"]] is item
+                else "superseded"
+            ),
+        }
+        for item in items
+    ]
+
+
+def course_completion(enrollment):
+    total_lessons = enrollment.course.published_lessons_count
+    completed_lessons = min(enrollment.completed_lessons_count, total_lessons)
+
+    if total_lessons == 0:
+        completion_percentage = 0
+    else:
+        completion_percentage = round((completed_lessons / total_lessons) * 100, 2)
+
+    return {
+        "completion_percentage": completion_percentage,
+        "completed_lessons": completed_lessons,
+        "total_lessons": total_lessons,
+    }
+
+
+def _recompute_published_totals(model, group_field):
+    totals = {
+        row[group_field]: (row["count"], row["duration"] or timedelta(0))
+        for row in Lesson.objects.order_by()
+        .filter(is_published=True)
+        .values(group_field)
+        .annotate(count=Count("id"), duration=Sum("duration"))
+    }
+    changed = []
+    for obj in model.objects.only(
+        "id", "published_lessons_count", "published_duration"
+    ).iterator():
+        count, duration = totals.get(obj.pk, (0, timedelta(0)))
+        if (obj.published_lessons_count, obj.published_duration) != (count, duration):
+            obj.published_lessons_count = count
+            obj.published_duration = duration
+            changed.append(obj)
+    model.objects.bulk_update(
+        changed, ["published_lessons_count", "published_duration"], batch_size=500
+    )
+    return len(changed)
+
+
+@transaction.atomic
+def recompute_lesson_counters():
+    """
+    Rebuild published lesson totals on courses and sections and completed
+    lesson counts on enrollments from GROUP BY passes.
+    """
+    courses = _recompute_published_totals(Course, "section__course_id")
+    _recompute_published_totals(Section, "section_id")
+
+    completed = {
+        (row["user_id"], row["lesson__section__course_id"]): row["count"]
+        for row in LessonProgress.objects.order_by()
+        .filter(is_completed=True, lesson__is_published=True)
+        .values("user_id", "lesson__section__course_id")
+        .annotate(count=Count("id"))
+    }
+    enrollments = []
+    for enrollment in Enrollment.objects.only(
+        "id", "student_id", "course_id", "completed_lessons_count"
+    ).iterator():
+        count = completed.get((enrollment.student_id, enrollment.course_id), 0)
+        if enrollment.completed_lessons_count != count:
+            enrollment.completed_lessons_count = count
+            enrollments.append(enrollment)
+    Enrollment.objects.bulk_update(
+        enrollments, ["completed_lessons_count"], batch_size=500
+    )
+
+    return courses, len(enrollments)
@@ -2,15 +2,32 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import generics
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from django.shortcuts import get_object_or_404
-from .serializers import LessonSerializer, StudentLessonSerializer, LessonProgressSerializer
+from django.db import transaction
+from .serializers import (
+    LessonSerializer,
+    StudentLessonSerializer,
+    LessonProgressSerializer,
+    LessonProgressSyncSerializer,
+)
 from .models import Lesson, LessonProgress
+from .utils import (
+    adjust_completed_lessons,
+    delete_lesson,
+    get_accessible_lesson,
+    publish_lesson,
+    sync_lesson_progress,
+    update_published_totals,
+)
 from courses.models import Course
 from enrollments.models import Enrollment
+from enrollments.access import is_enrolled
 from courses.permissions import IsInstructor
+from courses.mixins import CourseConditionalGetMixin
+from academy.media import IgnoreClientContentNegotiation, serve_file
 from django.utils import timezone
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
 
 
 class InstructorLessonListCreateAPIView(generics.ListCreateAPIView):
@@ -24,7 +41,11 @@ class InstructorLessonListCreateAPIView(generics.ListCreateAPIView):
         return course
 
     def get_queryset(self):
-        return Lesson.objects.filter(section__course=self.get_course()).select_related("section", "section__course")
+        return (
+            Lesson.objects.filter(section__course=self.get_course())
+            .select_related("section", "section__course")
+            .prefetch_related("resources")
+        )
 
     def perform_create(self, serializer):
         course = self.get_course()
@@ -43,20 +64,45 @@ class InstructorLessonDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsInstructor]
 
     def get_object(self):
+        lessons = Lesson.objects.all()
+        if self.request.method not in SAFE_METHODS:
+            # Row lock keeps the published totals in step with concurrent edits
+            lessons = lessons.select_for_update()
+
         return get_object_or_404(
-            Lesson,
+            lessons,
             pk=self.kwargs["lesson_id"],
             section__course__id=self.kwargs["course_id"],
             section__course__instructor__user=self.request.user,
         )
 
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        lesson = serializer.instance
+        previous_section_id, previous_duration = lesson.section_id, lesson.duration
+        serializer.save()
+        update_published_totals(
+            lesson, self.kwargs["course_id"], previous_section_id, previous_duration
+        )
+
+    def perform_destroy(self, instance):
+        delete_lesson(instance, self.kwargs["course_id"])
+
 
 class LessonPublishAPIView(APIView):
     permission_classes = [IsInstructor]
 
+    @transaction.atomic
     def post(self, request, course_id, lesson_id):
         lesson = get_object_or_404(
-            Lesson,
+            Lesson.objects.select_for_update(),
             pk=lesson_id,
             section__course__id=course_id,
             section__course__instructor__user=request.user,
@@ -65,23 +111,30 @@ class LessonPublishAPIView(APIView):
         if not lesson.title:
             raise PermissionDenied("Lesson must have a title.")
 
-        lesson.is_published = True
-        lesson.save()
+        if not lesson.is_published:
+            publish_lesson(lesson, course_id)
 
         return Response({"detail": "Lesson published."}, status=status.HTTP_200_OK)
 
 
-class StudentLessonListAPIView(generics.ListAPIView):
+class StudentLessonListAPIView(CourseConditionalGetMixin, generics.ListAPIView):
     serializer_class = StudentLessonSerializer
 
+    def get_validator_state(self):
+        version = super().get_validator_state()
+        if version is None:
+            return None
+        # Enrolled students see every published lesson, others only previews
+        return (version, is_enrolled(self.request.user, self.kwargs["course_id"]))
+
+    def get_last_modified(self):
+        # Enrolling changes the response without touching the course
+        return None
+
     def get_queryset(self):
         course_id = self.kwargs["course_id"]
 
-        is_enrolled = Enrollment.objects.filter(
-            student=self.request.user, course_id=course_id
-        ).exists()
-
-        if is_enrolled:
+        if is_enrolled(self.request.user, course_id):
             return Lesson.objects.filter(section__course_id=course_id, is_published=True).select_related("section")
 
         return Lesson.objects.filter(
@@ -93,24 +146,43 @@ class StudentLessonDetailAPIView(generics.RetrieveAPIView):
     serializer_class = LessonSerializer
 
     def get_object(self):
-        course_id = self.kwargs["course_id"]
-        lesson_id = self.kwargs["lesson_id"]
-
-        lesson = get_object_or_404(
-            Lesson, pk=lesson_id, section__course_id=course_id, is_published=True
+        return get_accessible_lesson(
+            self.request.user,
+            self.kwargs["course_id"],
+            self.kwargs["lesson_id"],
+            queryset=Lesson.objects.prefetch_related("resources"),
         )
 
-        if lesson.is_preview:
-            return lesson
-
-        is_enrolled = Enrollment.objects.filter(
-            student=self.request.user, course_id=course_id
-        ).exists()
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # ?content_hash=<hash> omits the lesson body when it is unchanged
+        context["known_content_hash"] = self.request.query_params.get("content_hash")
+        return context
+
+
+class LessonVideoAPIView(APIView):
+    """
+    Stream the video of a lesson to students allowed to open it, with
+    support for Range requests so players can seek.
+    """
+
+    content_negotiation_class = IgnoreClientContentNegotiation
+    # A seeking player sends many Range requests, which would soon exhaust
+    # the daily request limits; access is already tied to the lesson rules.
+    throttle_classes = []
+
+    def get(self, request, course_id, lesson_id):
+        lesson = get_accessible_lesson(
+            request.user,
+            course_id,
+            lesson_id,
+            queryset=Lesson.objects.only("id", "is_preview", "video_file"),
+        )
 
-        if not is_enrolled:
-            raise PermissionDenied("Enroll to access this lesson.")
+        if not lesson.video_file:
+            raise NotFound("This lesson has no video.")
 
-        return lesson
+        return serve_file(request, lesson.video_file.storage, lesson.video_file.name)
 
 
 class LessonProgressUpdateAPIView(generics.UpdateAPIView):
@@ -122,17 +194,61 @@ class LessonProgressUpdateAPIView(generics.UpdateAPIView):
         lesson_id = self.kwargs["lesson_id"]
         
         # Verify enrollment
-        is_enrolled = Enrollment.objects.filter(student=self.request.user, course_id=course_id).exists()
-        if not is_enrolled:
+        if not is_enrolled(self.request.user, course_id):
             raise PermissionDenied("Not enrolled in this course.")
 
         lesson = get_object_or_404(Lesson, pk=lesson_id, section__course_id=course_id)
         
-        progress, created = LessonProgress.objects.get_or_create(user=self.request.user, lesson=lesson)
+        # Row lock keeps the enrollment counter in step with concurrent updates
+        progress, created = LessonProgress.objects.select_for_update().get_or_create(
+            user=self.request.user, lesson=lesson
+        )
+        progress.lesson = lesson
         return progress
 
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
     def perform_update(self, serializer):
+        was_completed = serializer.instance.is_completed
+
         if serializer.validated_data.get('is_completed') and not serializer.instance.is_completed:
             serializer.save(completed_at=timezone.now())
         else:
             serializer.save()
+
+        progress = serializer.instance
+        if progress.lesson.is_published and progress.is_completed != was_completed:
+            adjust_completed_lessons(
+                Enrollment.objects.filter(
+                    student=self.request.user, course_id=self.kwargs["course_id"]
+                ),
+                1 if progress.is_completed else -1,
+            )
+
+
+class LessonProgressSyncAPIView(APIView):
+    """
+    Replay a batch of offline progress updates for one course in a single
+    transaction, returning a per-item result.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def post(self, request, course_id):
+        serializer = LessonProgressSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        enrollment = (
+            Enrollment.objects.select_for_update()
+            .filter(student=request.user, course_id=course_id)
+            .first()
+        )
+        if enrollment is None:
+            raise PermissionDenied("Not enrolled in this course.")
+
+        results = sync_lesson_progress(enrollment, serializer.validated_data["items"])
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -7,6 +7,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from courses.models import Course
 from enrollments.models import Enrollment
+from enrollments.access import is_enrolled
 from .models import Payment
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -19,7 +20,7 @@ class CreateCheckoutSessionView(APIView):
         course = get_object_or_404(Course, pk=course_id)
 
         # Check if already enrolled
-        if Enrollment.objects.filter(student=request.user, course=course).exists():
+        if is_enrolled(request.user, course.pk):
             return Response(
                 {"detail": "You are already enrolled in this course."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from reviews.utils import recompute_course_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute course rating counters from reviews and fix any drift."
+
+    def handle(self, *args, **options):
+        fixed = recompute_course_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} courses."))
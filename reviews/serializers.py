@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from courses.models import Course
 from .models import Review
+from .utils import RATINGS, rating_count_field
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -19,3 +21,20 @@ class ReviewSerializer(serializers.ModelSerializer):
             "student_name",
             "created_at",
         ]
+
+
+class CourseRatingSummarySerializer(serializers.ModelSerializer):
+    histogram = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Course
+        fields = [
+            "average_rating",
+            "reviews_count",
+            "histogram",
+        ]
+
+    def get_histogram(self, obj):
+        return {
+            str(rating): getattr(obj, rating_count_field(rating)) for rating in RATINGS
+        }
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import Review
+from .utils import apply_rating_change
+
+
+@receiver(pre_save, sender=Review)
+def cache_previous_rating(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._previous_rating = None
+        return
+
+    instance._previous_rating = (
+        Review.objects.filter(pk=instance.pk).values_list("rating", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Review)
+def add_rating_to_course(sender, instance, created, **kwargs):
+    previous_rating = None if created else getattr(instance, "_previous_rating", None)
+    apply_rating_change(instance.course_id, added=instance.rating, removed=previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def remove_rating_from_course(sender, instance, **kwargs):
+    apply_rating_change(instance.course_id, removed=instance.rating)
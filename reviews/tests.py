@@ -1,3 +1,96 @@
 from django.test import TestCase
+from courses.models import Course
+from users.models import InstructorProfile, User
+from .models import Review
+from .utils import recompute_course_ratings
 
-# Create your tests here.
+
+class CourseRatingCountersTests(TestCase):
+    """Review signals keep the rating counters equal to a full recompute."""
+
+    def setUp(self):
+        instructor = InstructorProfile.objects.create(
+            user=User.objects.create_user(
+                email="instructor@example.com", username="instructor"
+            )
+        )
+        self.course = Course.objects.create(
+            instructor=instructor, title="Course", description="About", is_published=True
+        )
+        self.students = [
+            User.objects.create_user(email=f"student{i}@example.com", username=f"student{i}")
+            for i in range(3)
+        ]
+
+    def counters(self):
+        course = Course.objects.get(pk=self.course.pk)
+        return {
+            "reviews_count": course.reviews_count,
+            "rating_sum": course.rating_sum,
+            "average_rating": course.average_rating,
+            "histogram": [getattr(course, f"rating_{r}_count") for r in range(1, 6)],
+        }
+
+    def assertCountersMatchRecompute(self):
+        incremental = self.counters()
+        self.assertEqual(recompute_course_ratings(), 0)
+        self.assertEqual(self.counters(), incremental)
+
+    def review(self, student, rating):
+        return Review.objects.create(student=student, course=self.course, rating=rating)
+
+    def test_create(self):
+        self.review(self.students[0], 5)
+        self.review(self.students[1], 4)
+        self.review(self.students[2], 4)
+
+        self.assertEqual(
+            self.counters(),
+            {
+                "reviews_count": 3,
+                "rating_sum": 13,
+                "average_rating": 13 / 3,
+                "histogram": [0, 0, 0, 2, 1],
+            },
+        )
+        self.assertCountersMatchRecompute()
+
+    def test_update_moves_the_rating_between_buckets(self):
+        review = self.review(self.students[0], 5)
+        self.review(self.students[1], 3)
+
+        review.rating = 1
+        review.save()
+        # Saving again without a change leaves the counters alone
+        review.comment = "Changed my mind"
+        review.save()
+
+        counters = self.counters()
+        self.assertEqual(counters["reviews_count"], 2)
+        self.assertEqual(counters["rating_sum"], 4)
+        self.assertEqual(counters["average_rating"], 2.0)
+        self.assertEqual(counters["histogram"], [1, 0, 1, 0, 0])
+        self.assertCountersMatchRecompute()
+
+    def test_delete(self):
+        first = self.review(self.students[0], 2)
+        second = self.review(self.students[1], 5)
+
+        first.delete()
+        self.assertEqual(self.counters()["histogram"], [0, 0, 0, 0, 1])
+        self.assertEqual(self.counters()["average_rating"], 5.0)
+
+        second.delete()
+        self.assertEqual(
+            self.counters(),
+            {"reviews_count": 0, "rating_sum": 0, "average_rating": 0.0, "histogram": [0] * 5},
+        )
+        self.assertCountersMatchRecompute()
+
+    def test_recompute_repairs_drifted_counters(self):
+        self.review(self.students[0], 3)
+        Course.objects.filter(pk=self.course.pk).update(rating_sum=99, rating_3_count=0)
+
+        self.assertEqual(recompute_course_ratings(), 1)
+        self.assertEqual(self.counters()["rating_sum"], 3)
+        self.assertEqual(self.counters()["histogram"], [0, 0, 1, 0, 0])
@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     ReviewCreateAPIView,
     CourseReviewListAPIView,
+    CourseRatingSummaryAPIView,
 )
 
 urlpatterns = [
@@ -15,6 +16,11 @@ urlpatterns = [
         CourseReviewListAPIView.as_view(),
         name="course-reviews",
     ),
+    path(
+        "public/courses/<int:course_id>/reviews/summary/",
+        CourseRatingSummaryAPIView.as_view(),
+        name="course-rating-summary",
+    ),
     path(
         "student/courses/<int:course_id>/reviews/",
         ReviewCreateAPIView.as_view(),
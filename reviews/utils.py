@@ -1,11 +1,94 @@
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast, Now
+from courses.catalog import bump_catalog_version
+from courses.models import Course
 from .models import Review
 
+RATINGS = range(1, 6)
 
-def update_course_rating(course):
-    qs = Review.objects.filter(course=course)
+AVERAGE_RATING = Case(
+    When(reviews_count=0, then=Value(0.0)),
+    default=Cast("rating_sum", FloatField()) / Cast("reviews_count", FloatField()),
+    output_field=FloatField(),
+)
 
-    course.average_rating = qs.aggregate(avg=Avg("rating"))["avg"] or 0
 
-    course.reviews_count = qs.count()
-    course.save()
+def rating_count_field(rating):
+    return f"rating_{rating}_count"
+
+
+RATING_COUNT_FIELDS = [rating_count_field(rating) for rating in RATINGS]
+
+
+def apply_rating_change(course_id, added=None, removed=None):
+    """
+    Incrementally apply one review rating being added and/or removed, and
+    bump the course content version.
+
+    Runs at most two single-row UPDATEs regardless of how many reviews the
+    course has. The average is recomputed in a second statement so it reads
+    the new counters on every backend (MySQL evaluates SET clauses left to
+    right).
+    """
+    counters = {"content_version": F("content_version") + 1, "updated_at": Now()}
+    rating_changed = added != removed
+
+    if rating_changed:
+        delta_sum = (added or 0) - (removed or 0)
+        delta_count = int(added is not None) - int(removed is not None)
+        counters["rating_sum"] = F("rating_sum") + delta_sum
+        counters["reviews_count"] = F("reviews_count") + delta_count
+        if added is not None:
+            field = rating_count_field(added)
+            counters[field] = F(field) + 1
+        if removed is not None:
+            field = rating_count_field(removed)
+            counters[field] = F(field) - 1
+
+    courses = Course.objects.filter(pk=course_id)
+    courses.update(**counters)
+
+    if rating_changed:
+        courses.update(average_rating=AVERAGE_RATING)
+        transaction.on_commit(bump_catalog_version)
+
+
+@transaction.atomic
+def recompute_course_ratings():
+    """
+    Reconcile drifted rating counters from a single GROUP BY over reviews.
+    Returns the number of courses that had to be corrected.
+    """
+    histograms = {}
+    rows = (
+        Review.objects.order_by()
+        .values("course_id", "rating")
+        .annotate(count=Count("id"))
+    )
+    for row in rows:
+        histograms.setdefault(row["course_id"], {})[row["rating"]] = row["count"]
+
+    fields = ["rating_sum", "reviews_count", "average_rating", *RATING_COUNT_FIELDS]
+    drifted = []
+
+    for course in Course.objects.only("id", *fields).iterator():
+        histogram = histograms.get(course.pk, {})
+        expected = {rating_count_field(r): histogram.get(r, 0) for r in RATINGS}
+        expected["rating_sum"] = sum(r * n for r, n in histogram.items())
+        expected["reviews_count"] = sum(histogram.values())
+        expected["average_rating"] = (
+            expected["rating_sum"] / expected["reviews_count"]
+            if expected["reviews_count"]
+            else 0
+        )
+
+        if all(getattr(course, field) == value for field, value in expected.items()):
+            continue
+
+        for field, value in expected.items():
+            setattr(course, field, value)
+        drifted.append(course)
+
+    Course.objects.bulk_update(drifted, fields, batch_size=500)
+    return len(drifted)
@@ -2,10 +2,13 @@ from rest_framework import generics
 from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 from django.db.models import Avg, Count
+from academy.pagination import CreatedAtCursorPagination
 from .models import Review
-from .serializers import ReviewSerializer
-from enrollments.models import Enrollment
+from .serializers import ReviewSerializer, CourseRatingSummarySerializer
+from .utils import RATING_COUNT_FIELDS
+from enrollments.access import is_enrolled
 from courses.models import Course
+from courses.mixins import CourseConditionalGetMixin
 from enrollments.permissions import IsStudent
 
 
@@ -21,18 +24,29 @@ class ReviewCreateAPIView(generics.CreateAPIView):
         if course.instructor.user == self.request.user:
             raise PermissionDenied("Instructor cannot review own course.")
 
-        is_enrolled = Enrollment.objects.filter(
-            student=self.request.user, course=course
-        ).exists()
-
-        if not is_enrolled:
+        if not is_enrolled(self.request.user, course.pk):
             raise PermissionDenied("You must be enrolled to review this course.")
 
         serializer.save(student=self.request.user, course=course)
 
 
-class CourseReviewListAPIView(generics.ListAPIView):
+class CourseReviewListAPIView(CourseConditionalGetMixin, generics.ListAPIView):
     serializer_class = ReviewSerializer
+    pagination_class = CreatedAtCursorPagination
+    ordering_fields = ["created_at"]
+    ordering = ["-created_at", "-id"]
 
     def get_queryset(self):
-        return Review.objects.filter(course_id=self.kwargs["course_id"])
+        return Review.objects.filter(course_id=self.kwargs["course_id"]).select_related(
+            "student"
+        )
+
+
+class CourseRatingSummaryAPIView(generics.RetrieveAPIView):
+    """Star histogram served from the counters kept on the Course row."""
+
+    serializer_class = CourseRatingSummarySerializer
+    lookup_url_kwarg = "course_id"
+    queryset = Course.objects.filter(is_published=True).only(
+        "id", "average_rating", "reviews_count", *RATING_COUNT_FIELDS
+    )
@@ -7,6 +7,7 @@ from .models import (
     VerificationSubmission,
     InstructorVerificationDocument,
     VerificationAuditLog,
+    OutboundEmail,
 )
 
 
@@ -168,3 +169,11 @@ class VerificationAuditLogAdmin(admin.ModelAdmin):
     def get_instructor_email(self, obj):
         return obj.submission.profile.user.email
     get_instructor_email.short_description = "Instructor Email"
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "recipients")
+    readonly_fields = ("created_at", "sent_at", "last_error")
@@ -0,0 +1,172 @@
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from .models import InstructorProfile, RevokedToken, User
+
+# User fields carried in the token; any other field is loaded on first access
+USER_CLAIM_FIELDS = ("email", "username", "role", "is_active", "is_staff", "is_superuser")
+CLAIMS_AT = "claims_at"
+
+# Cached copies of RevokedToken lookups and of User.claims_changed_at. A
+# missing entry is looked up in the database again, so eviction costs a
+# query but never lets a revoked token or outdated claims through.
+REVOKED_TOKEN_KEY = "auth:revoked:{jti}"
+CLAIMS_CHANGED_KEY = "auth:claims_changed:{user_id}"
+REVOCATION_CACHE_TIMEOUT = 300
+
+
+def add_user_claims(token, user):
+    """Add the claims ClaimsJWTAuthentication builds request.user from."""
+    for field in USER_CLAIM_FIELDS:
+        token[field] = getattr(user, field)
+
+    profile = None
+    if user.role == User.ROLE_INSTRUCTOR:
+        profile = InstructorProfile.objects.filter(user=user).only("id", "is_verified").first()
+    token["instructor_profile_id"] = profile.pk if profile else None
+    token["is_verified"] = bool(profile and profile.is_verified)
+    # Sub-second, so a change saved just before issuing does not outdate it
+    token[CLAIMS_AT] = time.time()
+    return token
+
+
+def _claims_lifetime():
+    # Refreshed access tokens copy the claims of their refresh token
+    lifetime = max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+    return int(lifetime.total_seconds())
+
+
+def revoke_token(token):
+    """Deny a token (by jti) until it would have expired anyway."""
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    if expires_at <= timezone.now():
+        return
+
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    transaction.on_commit(
+        lambda: cache.set(
+            REVOKED_TOKEN_KEY.format(jti=jti), True, REVOCATION_CACHE_TIMEOUT
+        )
+    )
+
+
+def is_token_revoked(token, cached=None):
+    """
+    Whether the token's jti is denylisted. ``cached`` is a value already read
+    from REVOKED_TOKEN_KEY; None (a miss) checks the database.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        return False
+    if cached is None:
+        cached = RevokedToken.objects.filter(jti=jti).exists()
+        cache.set(REVOKED_TOKEN_KEY.format(jti=jti), cached, REVOCATION_CACHE_TIMEOUT)
+    return cached
+
+
+def mark_claims_stale(user_id):
+    """
+    Make tokens issued for the user so far authenticate from the database,
+    since their claims (role, activity, verification) may no longer be true.
+    """
+    now = timezone.now()
+    User.objects.filter(pk=user_id).update(claims_changed_at=now)
+    transaction.on_commit(
+        lambda: cache.set(
+            CLAIMS_CHANGED_KEY.format(user_id=user_id), now.timestamp(), _claims_lifetime()
+        )
+    )
+
+
+def remember_claims_changed(user):
+    # add(), so a value read before a concurrent change never replaces it
+    changed_at = user.claims_changed_at.timestamp() if user.claims_changed_at else 0
+    cache.add(CLAIMS_CHANGED_KEY.format(user_id=user.pk), changed_at, _claims_lifetime())
+
+
+def _from_db(model, data):
+    # from_db takes values in concrete field order; missing fields are deferred.
+    # Claims are JSON (the user id claim is a string), so convert each value.
+    fields = [f for f in model._meta.concrete_fields if f.attname in data]
+    return model.from_db(
+        router.db_for_read(model),
+        [f.attname for f in fields],
+        [f.to_python(data[f.attname]) for f in fields],
+    )
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token's claims
+    instead of loading the users row (and instructor profile) per request.
+
+    The database is used when the view sets ``requires_full_user = True``,
+    when the token predates the claims or a later change to the user (see
+    mark_claims_stale), when that change time is not cached, or implicitly
+    when a field outside the claims is read. Revoked tokens are rejected
+    through the RevokedToken denylist, cached per jti.
+    """
+
+    def authenticate(self, request):
+        context = getattr(request, "parser_context", None) or {}
+        self.requires_full_user = getattr(context.get("view"), "requires_full_user", False)
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        revoked_key = REVOKED_TOKEN_KEY.format(jti=jti)
+        changed_key = CLAIMS_CHANGED_KEY.format(user_id=user_id)
+
+        state = cache.get_many([revoked_key, changed_key])
+        if is_token_revoked(validated_token, state.get(revoked_key)):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+
+        claims_at = validated_token.get(CLAIMS_AT)
+        changed_at = state.get(changed_key)
+        if (
+            self.requires_full_user
+            or user_id is None
+            or claims_at is None
+            or any(field not in validated_token for field in USER_CLAIM_FIELDS)
+            or changed_at is None
+            or changed_at >= claims_at
+        ):
+            user = super().get_user(validated_token)
+            remember_claims_changed(user)
+            return user
+
+        return self.user_from_claims(validated_token)
+
+    def user_from_claims(self, token):
+        user = _from_db(
+            User,
+            {
+                api_settings.USER_ID_FIELD: token[api_settings.USER_ID_CLAIM],
+                **{field: token[field] for field in USER_CLAIM_FIELDS},
+            },
+        )
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        profile_id = token.get("instructor_profile_id")
+        if profile_id is None:
+            # Known absent: reading it raises instead of querying
+            User.instructor_profile.related.set_cached_value(user, None)
+        else:
+            user.instructor_profile = _from_db(
+                InstructorProfile,
+                {
+                    "id": profile_id,
+                    "user_id": user.pk,
+                    "is_verified": token["is_verified"],
+                },
+            )
+        return user
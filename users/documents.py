@@ -0,0 +1,89 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from filestore.references import acquire
+from filestore.storage import file_sha256
+from .models import InstructorVerificationDocument
+from .validators import validate_document_file
+
+STORAGE_WORKERS = 4
+
+
+def validate_documents(files, field_name=None):
+    """
+    Run validate_document_file over every upload and report all failures as
+    one DRF ValidationError, keyed by ``field_name`` when given.
+    """
+    errors = []
+    for f in files:
+        try:
+            validate_document_file(f)
+        except DjangoValidationError as exc:
+            errors.extend(f"{f.name}: {message}" for message in exc.messages)
+
+    if errors:
+        raise ValidationError({field_name: errors} if field_name else errors)
+
+
+def store_verification_documents(submission, files):
+    """
+    Write validated uploads to storage concurrently and insert their
+    document rows with a single bulk_create. The document storage is
+    content-addressed, so content stored earlier is not written again.
+
+    Must run inside the caller's transaction, which owns the references
+    taken here.
+    """
+    field = InstructorVerificationDocument._meta.get_field("document")
+    documents = []
+    uploads = {}
+    for upload in files:
+        content_hash = getattr(upload, "content_hash", None) or file_sha256(upload)
+        upload.content_hash = content_hash
+        document = InstructorVerificationDocument(
+            submission=submission, content_hash=content_hash
+        )
+        document.document = field.storage.content_name(
+            field.generate_filename(document, upload.name), upload
+        )
+        documents.append(document)
+        uploads.setdefault(document.document.name, upload)
+
+    # bulk_create skips the field's signals, so take the references here,
+    # before any file is written or reused; the writer threads never touch
+    # the database
+    for name, count in Counter(d.document.name for d in documents).items():
+        acquire(name, count)
+
+    def store(name, upload):
+        # Whether this call wrote the file. The reference rows taken above
+        # stay locked until the transaction ends, so no other upload can
+        # write or reuse the same content meanwhile.
+        if field.storage.exists(name):
+            return False
+        field.storage.store(name, upload, max_length=field.max_length)
+        return True
+
+    with ThreadPoolExecutor(max_workers=STORAGE_WORKERS) as executor:
+        pending = {
+            name: executor.submit(store, name, upload) for name, upload in uploads.items()
+        }
+
+    written = []
+    error = None
+    for name, future in pending.items():
+        try:
+            if future.result():
+                written.append(name)
+        except Exception as exc:
+            error = error or exc
+
+    if error is not None:
+        # The failure rolls back the caller's transaction and the references
+        # with it, so nothing would collect these files later
+        for name in written:
+            field.storage.delete(name)
+        raise error
+
+    return InstructorVerificationDocument.objects.bulk_create(documents)
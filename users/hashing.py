@@ -0,0 +1,101 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+POOL_SIZE = getattr(settings, "PASSWORD_HASHING_POOL_SIZE", 0)
+MAX_PENDING = getattr(settings, "PASSWORD_HASHING_MAX_PENDING", None) or POOL_SIZE * 2
+QUEUE_TIMEOUT = getattr(settings, "PASSWORD_HASHING_QUEUE_TIMEOUT", 0.2)
+RETRY_AFTER = getattr(settings, "PASSWORD_HASHING_RETRY_AFTER", 5)
+TIMEOUT = getattr(settings, "PASSWORD_HASHING_TIMEOUT", 30)
+
+# Per web process: at most MAX_PENDING hashes are queued or running in the
+# pool; a request that cannot get a slot within QUEUE_TIMEOUT is turned away.
+_slots = threading.BoundedSemaphore(max(MAX_PENDING, 1))
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-ins at the moment, please retry shortly."
+    default_code = "password_hashing_unavailable"
+
+    def __init__(self, wait=RETRY_AFTER):
+        super().__init__()
+        # DRF's exception handler turns this into a Retry-After header
+        self.wait = wait
+
+
+def setup_worker():
+    # Spawned workers start with a bare interpreter
+    django.setup()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=setup_worker,
+            )
+        return _executor
+
+
+def _run(fn, *args):
+    if not POOL_SIZE:
+        return fn(*args)
+
+    if not _slots.acquire(timeout=QUEUE_TIMEOUT):
+        raise PasswordHashingUnavailable()
+    try:
+        future = _get_executor().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    # The slot is held until the job is done, not until this thread stops
+    # waiting, so a hash still running after a timeout keeps counting
+    future.add_done_callback(lambda _: _slots.release())
+
+    try:
+        return future.result(timeout=TIMEOUT)
+    except TimeoutError:
+        # A wedged worker must not hold this thread forever; cancelling only
+        # helps while the job is still queued
+        future.cancel()
+        raise PasswordHashingUnavailable()
+
+
+def hash_password(raw_password):
+    """make_password, run in the hashing pool when PASSWORD_HASHING_POOL_SIZE is set."""
+    if raw_password is None:
+        return make_password(None)
+    return _run(make_password, raw_password)
+
+
+def verify_password(user, raw_password):
+    """
+    user.check_password, run in the hashing pool. Hashes made with outdated
+    hasher settings are upgraded after a successful check.
+    """
+    if not _run(check_password, raw_password, user.password):
+        return False
+
+    # As in check_password: upgrade hashes from a hasher other than the
+    # preferred one as well as ones with outdated settings
+    hasher = identify_hasher(user.password)
+    if hasher.algorithm != get_hasher().algorithm or hasher.must_update(user.password):
+        user.password = hash_password(raw_password)
+        user.save(update_fields=["password"])
+    return True
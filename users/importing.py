@@ -0,0 +1,257 @@
+import csv
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from djoser.utils import encode_uid
+from courses.models import Course
+from enrollments.models import Enrollment
+from .hashing import PasswordHashingUnavailable, hash_password, setup_worker
+from .mail import queue_emails
+from .models import StudentProfile, User
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    existing: int = 0
+    enrollments: int = 0
+    errors: list = field(default_factory=list)
+    # Line of the first row not imported when the import had to stop early
+    stopped_at_line: int = None
+
+    def add_error(self, line, message):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "existing": self.existing,
+            "enrollments": self.enrollments,
+            "errors": self.errors,
+            "stopped_at_line": self.stopped_at_line,
+        }
+
+
+def read_rows(lines, file_format):
+    """
+    Yield ``(line_number, row)`` from CSV (with a header row) or JSON Lines.
+    ``lines`` is any iterable of text lines, so files are streamed.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def _course_ids(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(";", " ").replace(",", " ").split()
+    return [int(course_id) for course_id in value]
+
+
+def _clean_row(row):
+    if not isinstance(row, dict):
+        raise ValueError("Row is not an object.")
+
+    email = User.objects.normalize_email(str(row.get("email") or "").strip())
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError("Invalid email.")
+
+    try:
+        courses = _course_ids(row.get("courses"))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid course list.")
+
+    password = row.get("password")
+    return {
+        "email": email,
+        "username": str(row.get("username") or "").strip() or email,
+        "password": str(password) if password else None,
+        "batch": str(row.get("batch") or "").strip(),
+        "courses": courses,
+    }
+
+
+def _hash_passwords(passwords, executor):
+    if executor is None:
+        # The web process's bounded hashing pool (inline when it is disabled)
+        return [hash_password(p) for p in passwords]
+    return list(executor.map(make_password, passwords, chunksize=32))
+
+
+def _set_password_message(user):
+    link = settings.STUDENT_IMPORT_SET_PASSWORD_URL.format(
+        uid=encode_uid(user.pk), token=default_token_generator.make_token(user)
+    )
+    return (
+        "Your EduVerse account",
+        f"An account has been created for you.\n\nSet your password here:\n{link}",
+        [user.email],
+    )
+
+
+def _import_chunk(rows, course_ids, known_courses, seen, executor, result):
+    cleaned = []
+    for line, row in rows:
+        try:
+            data = _clean_row(row)
+        except ValueError as exc:
+            result.add_error(line, str(exc))
+            continue
+        unknown = [c for c in data["courses"] if c not in known_courses]
+        if unknown:
+            result.add_error(
+                line, f"Unknown course ids: {', '.join(map(str, unknown))}."
+            )
+            continue
+        if data["email"] in seen:
+            result.existing += 1
+            continue
+        seen.add(data["email"])
+        cleaned.append(data)
+
+    existing = set(
+        User.objects.filter(email__in=[d["email"] for d in cleaned]).values_list(
+            "email", flat=True
+        )
+    )
+    cleaned = [d for d in cleaned if d["email"] not in existing]
+    result.existing += len(existing)
+    if not cleaned:
+        return
+
+    # Rows without a password get an unusable one and a set-password link
+    with_password = [d for d in cleaned if d["password"]]
+    hashes = _hash_passwords([d["password"] for d in with_password], executor)
+    for data, hashed in zip(with_password, hashes):
+        data["password"] = hashed
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=d["email"],
+                    username=d["username"],
+                    password=d["password"] or make_password(None),
+                    role=User.ROLE_STUDENT,
+                )
+                for d in cleaned
+            ]
+        )
+        if any(user.pk is None for user in users):
+            # Backends that cannot return ids from a bulk insert (MySQL)
+            ids = dict(
+                User.objects.filter(email__in=[u.email for u in users]).values_list(
+                    "email", "id"
+                )
+            )
+            for user in users:
+                user.pk = ids[user.email]
+
+        StudentProfile.objects.bulk_create(
+            [StudentProfile(user=user, batch=d["batch"]) for user, d in zip(users, cleaned)]
+        )
+
+        # Enrollment signals are skipped; new users have no cached enrollments
+        Enrollment.objects.bulk_create(
+            [
+                Enrollment(student=user, course_id=course_id)
+                for user, d in zip(users, cleaned)
+                for course_id in dict.fromkeys([*course_ids, *d["courses"]])
+            ],
+            ignore_conflicts=True,
+        )
+        # bulk_create returns every object passed when conflicts are ignored
+        enrollments = Enrollment.objects.filter(student__in=users).count()
+
+        queue_emails(
+            _set_password_message(user)
+            for user, d in zip(users, cleaned)
+            if not d["password"]
+        )
+
+    result.created += len(users)
+    result.enrollments += enrollments
+
+
+def import_students(rows, course_ids=(), chunk_size=IMPORT_CHUNK_SIZE, workers=0):
+    """
+    Create students (with profiles and enrollments) from ``(line, row)``
+    pairs as produced by read_rows. Rows hold ``email`` and optionally
+    ``username``, ``password``, ``batch`` and ``courses``; every student is
+    also enrolled in ``course_ids``.
+
+    Each chunk checks existing emails with one query, hashes passwords and
+    inserts with bulk_create in its own transaction. Existing emails are
+    skipped and rows naming unknown courses are reported as errors.
+    Returns an ImportResult.
+
+    With the default ``workers=0`` passwords go through users.hashing, the
+    bounded pool shared by the web process. When that pool turns work away
+    the import stops before the current chunk is saved and reports the
+    first line not imported as ``stopped_at_line``; earlier chunks stay
+    committed, and since existing emails are skipped the file can simply be
+    sent again. Offline imports pass a worker count, or None for one per
+    CPU, to hash in a dedicated process pool.
+    """
+    result = ImportResult()
+    known_courses = set(Course.objects.values_list("id", flat=True))
+    for course_id in course_ids:
+        if course_id not in known_courses:
+            raise ValueError(f"Course {course_id} does not exist.")
+
+    seen = set()
+    rows = iter(rows)
+    executor = None
+    if workers != 0:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=setup_worker,
+        )
+
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            existing, errors = result.existing, len(result.errors)
+            try:
+                _import_chunk(chunk, course_ids, known_courses, seen, executor, result)
+            except PasswordHashingUnavailable:
+                # Nothing of this chunk was saved, so it is not counted either
+                result.existing = existing
+                del result.errors[errors:]
+                result.stopped_at_line = chunk[0][0]
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return result
@@ -0,0 +1,156 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+MAX_ATTEMPTS = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+RETRY_DELAY = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_RETRY_DELAY", 60))
+LEASE_DURATION = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_LEASE", 300))
+
+# A single background thread drains the outbox after commits, so request
+# threads never wait on SMTP. The send_queued_emails command retries the rest.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-outbox")
+
+
+def queue_email(subject, message, recipients, from_email=None):
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+    )
+
+    if getattr(settings, "EMAIL_OUTBOX_SEND_ON_COMMIT", True):
+        transaction.on_commit(lambda: _executor.submit(_deliver_in_background))
+
+    return email
+
+
+def queue_emails(messages, from_email=None):
+    """Queue many ``(subject, message, recipients)`` emails with one insert."""
+    emails = OutboundEmail.objects.bulk_create(
+        [
+            OutboundEmail(
+                subject=subject,
+                body=message,
+                from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                recipients=list(recipients),
+            )
+            for subject, message, recipients in messages
+        ],
+        batch_size=500,
+    )
+
+    if emails and getattr(settings, "EMAIL_OUTBOX_SEND_ON_COMMIT", True):
+        transaction.on_commit(lambda: _executor.submit(_deliver_in_background))
+
+    return emails
+
+
+def _deliver_in_background():
+    # Nothing reads the executor's futures, so log failures here; leased
+    # rows are picked up again once their lease runs out
+    try:
+        deliver_pending_emails()
+    except Exception:
+        logger.exception("Delivering queued emails failed")
+    finally:
+        # The worker thread owns its own database connection
+        connection.close()
+
+
+def _claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due emails to this sender in one short
+    transaction. Each row is taken with a conditional UPDATE, so of two
+    senders racing for it (SQLite ignores SELECT ... FOR UPDATE) only one
+    gets it. Rows whose lease ran out are picked up again.
+    """
+    now = timezone.now()
+    lease_until = now + LEASE_DURATION
+    due = OutboundEmail.objects.filter(
+        status__in=[OutboundEmail.STATUS_PENDING, OutboundEmail.STATUS_SENDING],
+        next_attempt_at__lte=now,
+    )
+
+    claimed = []
+    with transaction.atomic():
+        for email in due.order_by("next_attempt_at")[:batch_size]:
+            taken = due.filter(pk=email.pk).update(
+                status=OutboundEmail.STATUS_SENDING, next_attempt_at=lease_until
+            )
+            if taken:
+                email.status = OutboundEmail.STATUS_SENDING
+                email.next_attempt_at = lease_until
+                claimed.append(email)
+    return claimed
+
+
+def _send(email, mail_connection):
+    message = EmailMessage(
+        email.subject,
+        email.body,
+        email.from_email,
+        email.recipients,
+        connection=mail_connection,
+    )
+    try:
+        # No-op while the connection is open; reopens it after a failure
+        mail_connection.open()
+        message.send()
+    except Exception as exc:
+        mail_connection.close()
+        email.attempts += 1
+        email.last_error = str(exc)
+        if email.attempts >= MAX_ATTEMPTS:
+            email.status = OutboundEmail.STATUS_FAILED
+        else:
+            email.status = OutboundEmail.STATUS_PENDING
+            email.next_attempt_at = timezone.now() + RETRY_DELAY * (
+                2 ** (email.attempts - 1)
+            )
+        return False
+
+    email.status = OutboundEmail.STATUS_SENT
+    email.sent_at = timezone.now()
+    return True
+
+
+def deliver_pending_emails(batch_size=BATCH_SIZE):
+    """
+    Send every due email in batches over one reused mail connection.
+    Rows are leased in a short transaction, sent with no transaction or
+    lock held and their outcome written afterwards. Failed sends are
+    retried with exponential backoff up to MAX_ATTEMPTS.
+    Returns ``(sent, failed)`` counts.
+    """
+    sent = failed = 0
+    mail_connection = get_connection(fail_silently=False)
+
+    try:
+        while True:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                break
+
+            for email in batch:
+                if _send(email, mail_connection):
+                    sent += 1
+                else:
+                    failed += 1
+
+            OutboundEmail.objects.bulk_update(
+                batch,
+                ["status", "attempts", "last_error", "next_attempt_at", "sent_at"],
+            )
+    finally:
+        mail_connection.close()
+
+    return sent, failed
@@ -0,0 +1,69 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from users.importing import IMPORT_CHUNK_SIZE, import_students, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create student accounts from a CSV or JSON Lines file with columns "
+        "email, username, password, batch, courses. Rows without a password "
+        "are emailed a set-password link."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            default=[],
+            dest="courses",
+            help="Enroll every imported student in this course (repeatable).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Password hashing processes (default: CPU count, 0 uses the "
+                "PASSWORD_HASHING_POOL_SIZE pool or hashes inline)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if os.path.splitext(path)[1].lower() == ".csv" else "jsonl"
+        )
+
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                result = import_students(
+                    read_rows(f, file_format),
+                    course_ids=options["courses"],
+                    chunk_size=options["chunk_size"],
+                    workers=options["workers"],
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error['line']}: {error['error']}")
+        if result.stopped_at_line is not None:
+            self.stderr.write(
+                f"Password hashing is busy; rows from line {result.stopped_at_line} "
+                "on were not imported. Run the import again to add them."
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} students and {result.enrollments} "
+                f"enrollments, skipped {result.existing} existing emails."
+            )
+        )
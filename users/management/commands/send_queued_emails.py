@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from users.mail import BATCH_SIZE, deliver_pending_emails
+
+
+class Command(BaseCommand):
+    help = "Deliver pending emails from the outbox, retrying failed ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--watch",
+            type=int,
+            default=0,
+            metavar="SECONDS",
+            help="Keep running and poll the outbox every SECONDS.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending_emails(batch_size=options["batch_size"])
+            if sent or failed or not options["watch"]:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Sent {sent} emails, {failed} failed.")
+                )
+            if not options["watch"]:
+                break
+            time.sleep(options["watch"])
@@ -3,6 +3,8 @@ from django.db import models
 from django.db.models import Q
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from academy import settings
+from filestore.fields import ContentAddressedFileField
+from .hashing import hash_password
 
 
 class CustomUserManager(BaseUserManager):
@@ -13,7 +15,10 @@ class CustomUserManager(BaseUserManager):
             raise ValueError("The given email must be set")
         email = self.normalize_email(email)
         user = self.model(email=email, **extra_fields)
-        user.set_password(password)
+        # set_password, with the hashing in the pool. May raise
+        # PasswordHashingUnavailable (503) when the pool is saturated.
+        user.password = hash_password(password)
+        user._password = password
         user.save(using=self._db)
         return user
 
@@ -51,6 +56,10 @@ class User(AbstractUser):
     role = models.CharField(
         max_length=10, choices=ROLE_CHOICES, default=ROLE_STUDENT)
 
+    # Set whenever the user or their instructor profile changes; tokens whose
+    # claims are older authenticate from the database (users.authentication)
+    claims_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
@@ -129,7 +138,9 @@ class InstructorVerificationDocument(models.Model):
         VerificationSubmission, on_delete=models.CASCADE, related_name="documents"
     )
 
-    document = models.FileField(upload_to="verification_documents/")
+    document = ContentAddressedFileField(upload_to="verification_documents/")
+    # SHA-256 of the file content, used to avoid storing identical documents twice
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -172,3 +183,60 @@ class VerificationAuditLog(models.Model):
         return (
             f"{self.action} | submission={self.submission_id} | admin={self.admin_id}"
         )
+
+
+class OutboundEmail(models.Model):
+    """
+    Durable outbox for notification emails. Rows are written in the same
+    transaction as the change that triggers them and delivered after commit
+    by users.mail. A ``sending`` row is leased to one sender until its
+    ``next_attempt_at``; after that it is due again.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"OutboundEmail({self.subject}, {self.status})"
+
+
+class RevokedToken(models.Model):
+    """
+    Denylisted token (access or refresh), kept until it would have expired.
+    users.authentication caches lookups but this table is authoritative.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"RevokedToken({self.jti})"
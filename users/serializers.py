@@ -3,9 +3,17 @@ from django.contrib.auth import get_user_model
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from requests import Response
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.utils import timezone
+from django.db import transaction
 
-from .validators import validate_document_file
+from .authentication import add_user_claims, is_token_revoked
+from .documents import store_verification_documents, validate_documents
 from .models import (
     InstructorProfile,
     StudentProfile,
@@ -34,6 +42,38 @@ class CustomUserSerializer(UserSerializer):
         }
 
 
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Access tokens refreshed from this token copy its claims
+        return add_user_claims(super().get_token(user), user)
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if is_token_revoked(RefreshToken(attrs["refresh"])):
+            raise InvalidToken("Token has been revoked.")
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    refresh = serializers.CharField(required=False)
+
+
+class StudentImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=["csv", "jsonl"], required=False)
+    courses = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+    def validate(self, attrs):
+        if "format" not in attrs:
+            name = attrs["file"].name.lower()
+            attrs["format"] = "csv" if name.endswith(".csv") else "jsonl"
+        return attrs
+
+
 class StudentProfileSerializer(serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
 
@@ -133,6 +173,7 @@ class StudentRegisterSerializer(serializers.ModelSerializer):
         fields = ("email", "username", "password", "batch")
         extra_kwargs = {"password": {"write_only": True}}
 
+    @transaction.atomic
     def create(self, validated_data):
         batch = validated_data.pop("batch", "")
 
@@ -172,6 +213,7 @@ class InstructorRegisterSerializer(serializers.ModelSerializer):
         )
         extra_kwargs = {"password": {"write_only": True}}
 
+    @transaction.atomic
     def create(self, validated_data):
         bio = validated_data.pop("bio", "")
         expertise = validated_data.pop("expertise", "")
@@ -194,11 +236,7 @@ class InstructorRegisterSerializer(serializers.ModelSerializer):
             profile=profile, status=VerificationSubmission.STATUS_PENDING
         )
 
-        for doc in documents:
-            validate_document_file(doc)
-            InstructorVerificationDocument.objects.create(
-                submission=submission, document=doc
-            )
+        store_verification_documents(submission, documents)
 
         profile.verification_requested_at = timezone.now()
         profile.is_verified = False
@@ -213,6 +251,10 @@ class InstructorRegisterSerializer(serializers.ModelSerializer):
                 "A user with this email already exists.")
         return value
 
+    def validate_verification_documents(self, value):
+        validate_documents(value)
+        return value
+
 
 class VerificationSubmissionAdminSerializer(serializers.ModelSerializer):
     instructor_email = serializers.EmailField(
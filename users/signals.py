@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import User, VerificationSubmission
+from .mail import queue_email
+from .authentication import mark_claims_stale
+from .models import InstructorProfile, User, VerificationSubmission
 
 
 @receiver(post_save, sender=User)
@@ -12,16 +13,7 @@ def notify_admin_on_instructor_signup(sender, instance, created, **kwargs):
         if admin_emails:
             subject = "New instructor signup"
             message = f"New instructor registered: {instance.email} (id: {instance.pk})"
-            try:
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    admin_emails,
-                    fail_silently=False,
-                )
-            except Exception:
-                pass
+            queue_email(subject, message, admin_emails)
 
 
 @receiver(post_save, sender=VerificationSubmission)
@@ -40,10 +32,7 @@ def notify_admin_on_submission(sender, instance, created, **kwargs):
         f"Submission ID: {instance.id}"
     )
 
-    try:
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, admin_emails)
-    except Exception:
-        pass
+    queue_email(subject, message, admin_emails)
 
 
 @receiver(post_save, sender=VerificationSubmission)
@@ -76,13 +65,7 @@ def notify_instructor_on_review(sender, instance, created, **kwargs):
     else:
         return
 
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=True,
-    )
+    queue_email(subject, message, [user.email])
 
 
 @receiver(pre_save, sender=VerificationSubmission)
@@ -97,3 +80,17 @@ def cache_previous_status(sender, instance, **kwargs):
         )
     except VerificationSubmission.DoesNotExist:
         instance._previous_status = None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_claims(sender, instance, created=False, **kwargs):
+    # A new user has no tokens yet
+    if not created:
+        mark_claims_stale(instance.pk)
+
+
+@receiver(post_save, sender=InstructorProfile)
+@receiver(post_delete, sender=InstructorProfile)
+def invalidate_instructor_claims(sender, instance, **kwargs):
+    mark_claims_stale(instance.user_id)
@@ -1,3 +1,262 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from filestore.models import StoredFile
+from filestore.storage import ContentAddressedStorage, content_addressed_storage
+from . import hashing
+from .backends import PooledModelBackend
+from .authentication import ClaimsJWTAuthentication, revoke_token
+from .documents import store_verification_documents
+from .importing import import_students, read_rows
+from .models import InstructorProfile, User, VerificationSubmission
+from .serializers import ClaimsTokenObtainPairSerializer
+from .throttles import IPRateThrottle
 
-# Create your tests here.
+
+class TenPerMinuteThrottle(IPRateThrottle):
+    rate = "10/min"
+
+
+class CounterRateThrottleTests(SimpleTestCase):
+    """
+    Throttle state lives only in the cache, so a fresh throttle instance per
+    request behaves like separate worker processes sharing one store.
+    """
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        cache_settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                }
+            }
+        )
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+
+        self.request = APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        self.window_start = 1_000 * 60
+
+    def allow(self, now):
+        throttle = TenPerMinuteThrottle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(self.request, None), throttle
+
+    def test_limit_is_shared_between_instances(self):
+        results = [self.allow(self.window_start + i)[0] for i in range(11)]
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for i in range(10):
+            self.allow(self.window_start + i)
+
+        # Halfway through the next window, half of the previous count remains
+        halfway = self.window_start + 60 + 30
+        results = [self.allow(halfway)[0] for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_wait_reports_time_until_a_slot_frees(self):
+        for i in range(10):
+            self.allow(self.window_start + i)
+
+        # The full window has to become the previous one before it drains
+        allowed, throttle = self.allow(self.window_start + 30)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 30)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ClaimsJWTAuthenticationTests(TestCase):
+    """
+    The cache only speeds up revocation and staleness checks; losing it must
+    never let a revoked token or outdated claims through.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="student@example.com", username="student", password="secret-pass"
+        )
+
+    def access_token(self):
+        return ClaimsTokenObtainPairSerializer.get_token(self.user).access_token
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return ClaimsJWTAuthentication().authenticate(request)
+
+    def test_claims_are_used_once_the_change_time_is_cached(self):
+        token = self.access_token()
+        self.authenticate(token)
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(token)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.role, User.ROLE_STUDENT)
+
+    def test_revoked_token_stays_revoked_after_cache_loss(self):
+        token = self.access_token()
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke_token(token)
+        cache.clear()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_deactivated_user_is_rejected_after_cache_loss(self):
+        token = self.access_token()
+        self.authenticate(token)
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        cache.clear()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_token_issued_right_after_a_change_uses_claims(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        token = self.access_token()
+        self.authenticate(token)
+
+        with self.assertNumQueries(0):
+            self.authenticate(token)
+
+
+class StoreVerificationDocumentsTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        user = User.objects.create_user(
+            email="instructor@example.com", username="instructor"
+        )
+        profile = InstructorProfile.objects.create(user=user)
+        self.submission = VerificationSubmission.objects.create(profile=profile)
+
+    def test_failed_upload_removes_files_written_by_the_call(self):
+        files = [
+            SimpleUploadedFile("id.pdf", b"%PDF-1.4 first"),
+            SimpleUploadedFile("degree.pdf", b"%PDF-1.4 second"),
+        ]
+        store = ContentAddressedStorage.store
+
+        def failing_store(storage, name, content, max_length=None):
+            if content.name == "degree.pdf":
+                raise OSError("disk full")
+            return store(storage, name, content, max_length=max_length)
+
+        with mock.patch.object(ContentAddressedStorage, "store", failing_store):
+            with self.assertRaises(OSError), transaction.atomic():
+                store_verification_documents(self.submission, files)
+
+        self.assertFalse(StoredFile.objects.exists())
+        for directory in content_addressed_storage.listdir("verification_documents")[0]:
+            self.assertEqual(
+                content_addressed_storage.listdir(f"verification_documents/{directory}"),
+                ([], []),
+            )
+
+
+class PasswordHashingPoolTests(SimpleTestCase):
+    def setUp(self):
+        # A spare worker, so only the slot can hold a second job back
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        for name, value in {
+            "POOL_SIZE": 1,
+            "TIMEOUT": 0.05,
+            "QUEUE_TIMEOUT": 0.05,
+            "_slots": threading.BoundedSemaphore(1),
+            "_executor": executor,
+        }.items():
+            patcher = mock.patch.object(hashing, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_timed_out_hash_keeps_its_slot_until_it_finishes(self):
+        release = threading.Event()
+        finished = threading.Event()
+
+        def stuck():
+            release.wait(5)
+            finished.set()
+            return "done"
+
+        with self.assertRaises(hashing.PasswordHashingUnavailable):
+            hashing._run(stuck)
+        # The stuck job still occupies the only slot
+        with self.assertRaises(hashing.PasswordHashingUnavailable):
+            hashing._run(str, "next")
+
+        release.set()
+        finished.wait(5)
+        self.assertEqual(hashing._run(str, "next"), "next")
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+)
+class PooledModelBackendTests(TestCase):
+    def test_login_upgrades_a_hash_from_another_hasher(self):
+        user = User.objects.create_user(email="student@example.com", username="student")
+        user.password = make_password("secret-pass", hasher="md5")
+        user.save(update_fields=["password"])
+
+        authenticated = PooledModelBackend().authenticate(
+            None, username="student@example.com", password="secret-pass"
+        )
+
+        self.assertEqual(authenticated.pk, user.pk)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(user.check_password("secret-pass"))
+
+
+class ImportStudentsTests(TestCase):
+    def test_busy_hashing_pool_stops_before_the_current_chunk(self):
+        lines = [
+            "email,password,courses",
+            "first@example.com,secret-pass-1,",
+            "second@example.com,secret-pass-2,",
+            "third@example.com,,",
+        ]
+        hash_password = hashing.hash_password
+        calls = []
+
+        def busy_after_first(raw_password):
+            calls.append(raw_password)
+            if len(calls) > 1:
+                raise hashing.PasswordHashingUnavailable()
+            return hash_password(raw_password)
+
+        with mock.patch("users.importing.hash_password", busy_after_first):
+            result = import_students(read_rows(lines, "csv"), chunk_size=1)
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.stopped_at_line, 3)
+        self.assertEqual(
+            list(User.objects.values_list("email", flat=True)), ["first@example.com"]
+        )
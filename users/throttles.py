@@ -1,8 +1,81 @@
 # users/throttles.py
+from rest_framework import throttling
 from rest_framework.throttling import SimpleRateThrottle
 
 
-class IPRateThrottle(SimpleRateThrottle):
+class CounterRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter throttle kept in the shared cache.
+
+    Instead of DRF's list of request timestamps, each client has one integer
+    counter per fixed window. The previous window's count is weighted by how
+    much of it still overlaps the sliding window, and the current one is
+    bumped with cache.incr, so the limit holds across worker processes.
+    The limit is exact only on a cache with atomic incr (Redis, Memcached);
+    on the file cache used in development it is approximate.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        current_key = f"{self.key}:{window}"
+        previous_key = f"{self.key}:{window - 1}"
+        self.elapsed = (now % self.duration) / self.duration
+
+        counts = self.cache.get_many([current_key, previous_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        if self.weighted_count() >= self.num_requests:
+            return self.throttle_failure()
+
+        self.current = self.increment(current_key)
+        if self.weighted_count() > self.num_requests:
+            # Lost a race with concurrent requests for the last slot
+            return self.throttle_failure()
+        return True
+
+    def weighted_count(self):
+        return self.previous * (1 - self.elapsed) + self.current
+
+    def increment(self, key):
+        # The counter must outlive its window to be read as the previous one
+        timeout = self.duration * 2
+        if self.cache.add(key, 1, timeout):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(key, 1, timeout)
+            return 1
+
+    def wait(self):
+        remaining = self.num_requests - self.current
+        if remaining > 0:
+            # Wait until enough of the previous window has slid out
+            needed = 1 - remaining / self.previous
+            return max(needed - self.elapsed, 0) * self.duration
+        # This window is full; it only drains once it becomes the previous one
+        needed = 1 - self.num_requests / self.current
+        return (1 - self.elapsed + needed) * self.duration
+
+
+class AnonRateThrottle(CounterRateThrottle, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(CounterRateThrottle, throttling.UserRateThrottle):
+    pass
+
+
+class IPRateThrottle(CounterRateThrottle):
     scope = "ip"
 
     def get_cache_key(self, request, view):
@@ -10,12 +83,41 @@ class IPRateThrottle(SimpleRateThrottle):
         return self.cache_format % {"scope": self.scope, "ident": ident}
 
 
-class EmailRateThrottle(SimpleRateThrottle):
+class EmailRateThrottle(CounterRateThrottle):
+    """
+    Limits requests per submitted email. Reading the email parses the body,
+    so only add it through EmailThrottleMixin, which runs it last.
+    """
+
     scope = "email"
 
     def get_cache_key(self, request, view):
-        # only apply when an email is present (registration views)
-        email = request.data.get("email")
-        if not email:
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not email or not isinstance(email, str):
             return None
         return self.cache_format % {"scope": self.scope, "ident": email.lower()}
+
+
+class EmailThrottleMixin:
+    """
+    View mixin adding EmailRateThrottle after the default (IP, anon, user)
+    throttles. Throttles are checked in order and the first refusal stops
+    the check, so a request already over a cheap limit is rejected without
+    its body being parsed. ``email_throttle_actions`` limits the email
+    throttle to some viewset actions.
+    """
+
+    email_throttle_actions = None
+
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        actions = self.email_throttle_actions
+        if actions is None or getattr(self, "action", None) in actions:
+            throttles.append(EmailRateThrottle())
+        return throttles
+
+    def check_throttles(self, request):
+        for throttle in self.get_throttles():
+            if not throttle.allow_request(request, self):
+                self.throttled(request, throttle.wait())
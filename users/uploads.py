@@ -0,0 +1,82 @@
+import hashlib
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from rest_framework.exceptions import ValidationError
+from .validators import MAX_UPLOAD_SIZE, SIGNATURE_SIZE, validate_document_signature
+
+
+class SizeLimitedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream every uploaded file in chunks to a temporary file and abandon it
+    as soon as it grows past ``max_size`` or its first bytes do not match its
+    extension, so bad uploads are never buffered in full. Abandoned files are
+    recorded on ``request.rejected_uploads`` as ``{field_name: [message]}``.
+    Accepted files get a ``content_hash`` (SHA-256) computed on the fly.
+    """
+
+    max_size = MAX_UPLOAD_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.head = b""
+        self.digest = hashlib.sha256()
+
+    def record_rejection(self, message):
+        rejected = getattr(self.request, "rejected_uploads", {})
+        rejected.setdefault(self.field_name, []).append(f"{self.file_name}: {message}")
+        self.request.rejected_uploads = rejected
+        self.file.close()
+
+    def reject(self, message):
+        self.record_rejection(message)
+        raise SkipFile()
+
+    def sniff(self):
+        """Return the rejection message for the buffered head, if any."""
+        try:
+            validate_document_signature(self.file_name, self.head)
+        except DjangoValidationError as exc:
+            return exc.messages[0]
+        return None
+
+    def receive_data_chunk(self, raw_data, start):
+        if len(self.head) < SIGNATURE_SIZE:
+            self.head += raw_data[: SIGNATURE_SIZE - len(self.head)]
+            error = self.sniff() if len(self.head) == SIGNATURE_SIZE else None
+            if error:
+                self.reject(error)
+
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.reject("File size exceeds maximum of 5MB.")
+
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        # Files shorter than a signature are only sniffed once complete
+        error = self.sniff() if len(self.head) < SIGNATURE_SIZE else None
+        if error:
+            self.record_rejection(error)
+            return None
+
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.digest.hexdigest()
+        return uploaded_file
+
+
+class StreamedUploadMixin:
+    """
+    View mixin installing SizeLimitedUploadHandler before the body is parsed.
+    Call ``check_rejected_uploads()`` after touching ``request.data``.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [SizeLimitedUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def check_rejected_uploads(self, request):
+        rejected = getattr(request, "rejected_uploads", None)
+        if rejected:
+            raise ValidationError(rejected)
@@ -30,5 +30,6 @@ urlpatterns = [
         "admin/verification-submissions/<int:submission_id>/audit/",
         views.AdminVerificationAuditLogAPIView.as_view(),
     ),
+    path("admin/students/import/", views.StudentImportAPIView.as_view()),
     path("profile/", views.ProfileDetail.as_view()),
 ]
@@ -1,15 +1,58 @@
 import os
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
 ALLOWED_EXTENSIONS = [".pdf", ".jpg", ".jpeg", ".png"]
 MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5 MB
 
+# Leading bytes identifying each allowed document type
+FILE_SIGNATURES = {
+    ".pdf": b"%PDF-",
+    ".jpg": b"\xff\xd8\xff",
+    ".jpeg": b"\xff\xd8\xff",
+    ".png": b"\x89PNG\r\n\x1a\n",
+}
+SIGNATURE_SIZE = max(len(signature) for signature in FILE_SIGNATURES.values())
 
-def validate_document_file(uploaded_file):
-    ext = os.path.splitext(uploaded_file.name)[1].lower()
+VALIDATED_HASH_TIMEOUT = 60 * 60 * 24
+
+
+def _validated_hash_key(content_hash, ext):
+    return f"documents:validated:{content_hash}:{ext}"
+
+
+def validate_document_extension(name):
+    ext = os.path.splitext(name)[1].lower()
     if ext not in ALLOWED_EXTENSIONS:
         raise ValidationError(
             f"Unsupported file extension: {ext}. Allowed: {ALLOWED_EXTENSIONS}"
         )
+    return ext
+
+
+def validate_document_signature(name, head):
+    """Check the first bytes of an upload against the type its name claims."""
+    ext = validate_document_extension(name)
+    if not head.startswith(FILE_SIGNATURES[ext]):
+        raise ValidationError(f"File content does not match its {ext} extension.")
+
+
+def validate_document_file(uploaded_file):
+    ext = validate_document_extension(uploaded_file.name)
+
     if uploaded_file.size > MAX_UPLOAD_SIZE:
         raise ValidationError("File size exceeds maximum of 5MB.")
+
+    # Uploads streamed through users.uploads carry a SHA-256 of their content;
+    # identical documents that already passed are not sniffed again.
+    content_hash = getattr(uploaded_file, "content_hash", None)
+    if content_hash and cache.get(_validated_hash_key(content_hash, ext)):
+        return
+
+    uploaded_file.seek(0)
+    head = uploaded_file.read(SIGNATURE_SIZE)
+    uploaded_file.seek(0)
+    validate_document_signature(uploaded_file.name, head)
+
+    if content_hash:
+        cache.set(_validated_hash_key(content_hash, ext), True, VALIDATED_HASH_TIMEOUT)
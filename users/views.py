@@ -1,3 +1,4 @@
+import codecs
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.views import APIView
 from rest_framework import generics, status, mixins, viewsets
@@ -14,6 +15,12 @@ from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.http import QueryDict
 from django.db import transaction
+from djoser.views import UserViewSet
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.exceptions import ValidationError
 from .permissions import IsInstructor, IsStudent, IsAdmin
 from .serializers import (
     AdminProfileSerializer,
@@ -22,6 +29,8 @@ from .serializers import (
     StudentProfileSerializer,
     StudentRegisterSerializer,
     InstructorRegisterSerializer,
+    StudentImportSerializer,
+    TokenRevokeSerializer,
     RejectReasonSerializer,
     EmptySerializer,
     VerificationAuditLogSerializer,
@@ -31,30 +40,87 @@ from .serializers import (
 from .models import (
     StudentProfile,
     InstructorProfile,
-    InstructorVerificationDocument,
     VerificationSubmission,
     VerificationAuditLog,
 )
-from .validators import validate_document_file
+from .documents import store_verification_documents, validate_documents
+from .uploads import StreamedUploadMixin
+from .throttles import EmailThrottleMixin
+from .authentication import revoke_token
+from .hashing import RETRY_AFTER as HASHING_RETRY_AFTER
+from .importing import import_students, read_rows
 
 User = get_user_model()
 
 
-class StudentRegisterView(mixins.CreateModelMixin, viewsets.GenericViewSet):
+class StudentRegisterView(
+    EmailThrottleMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
+):
     queryset = User.objects.all()
     serializer_class = StudentRegisterSerializer
     permission_classes = [AllowAny]
 
 
-class InstructorRegisterView(mixins.CreateModelMixin, viewsets.GenericViewSet):
+class InstructorRegisterView(
+    EmailThrottleMixin,
+    StreamedUploadMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
+):
     queryset = User.objects.all()
     serializer_class = InstructorRegisterSerializer
     permission_classes = [AllowAny]
     parser_classes = [MultiPartParser, FormParser]
 
+    def create(self, request, *args, **kwargs):
+        request.data  # parse the body so oversized uploads are reported first
+        self.check_rejected_uploads(request)
+        return super().create(request, *args, **kwargs)
+
+
+class AuthUserViewSet(EmailThrottleMixin, UserViewSet):
+    """Djoser's user endpoints with the email throttle on its email-taking actions."""
+
+    email_throttle_actions = {"create", "reset_password", "resend_activation"}
+    # /users/me/ can update the user, so load the real row
+    requires_full_user = True
+
+
+class AuthTokenObtainPairView(EmailThrottleMixin, TokenObtainPairView):
+    pass
+
+
+class TokenRevokeAPIView(APIView):
+    """
+    Revoke the access token of this request and, if given, a refresh token
+    of the same user.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TokenRevokeSerializer
+
+    def post(self, request):
+        serializer = TokenRevokeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        refresh = serializer.validated_data.get("refresh")
+        if refresh:
+            try:
+                refresh = RefreshToken(refresh)
+            except TokenError as exc:
+                raise ValidationError({"refresh": [str(exc)]})
+            if str(refresh.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                raise ValidationError({"refresh": ["Token belongs to another user."]})
+            revoke_token(refresh)
+
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
+
 
 class ProfileDetail(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
+    # Updates and deletes the user itself, so load the real row
+    requires_full_user = True
 
     def get_serializer_class(self):
         user = self.request.user
@@ -161,6 +227,7 @@ class AdminVerificationSubmissionViewSet(viewsets.ReadOnlyModelViewSet):
         return qs
 
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def approve(self, request, pk=None):
         submission = self.get_object()
 
@@ -187,6 +254,7 @@ class AdminVerificationSubmissionViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({"detail": "Instructor verified."})
 
     @action(detail=True, methods=["post"])
+    @transaction.atomic
     def reject(self, request, pk=None):
         reason = request.data.get("rejection_reason")
         if not reason:
@@ -218,7 +286,7 @@ class AdminVerificationSubmissionViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({"detail": "Submission rejected."})
 
 
-class CreateVerificationSubmissionAPIView(APIView):
+class CreateVerificationSubmissionAPIView(StreamedUploadMixin, APIView):
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [IsInstructor]
 
@@ -251,21 +319,19 @@ class CreateVerificationSubmissionAPIView(APIView):
             )
 
         files = request.FILES.getlist("verification_documents")
+        self.check_rejected_uploads(request)
         if not files:
             return Response(
                 {"detail": "verification_documents is required."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        validate_documents(files, field_name="verification_documents")
+
         submission = VerificationSubmission.objects.create(
             profile=profile, status=VerificationSubmission.STATUS_PENDING
         )
-
-        for f in files:
-            validate_document_file(f)
-            InstructorVerificationDocument.objects.create(
-                submission=submission, document=f
-            )
+        store_verification_documents(submission, files)
 
         return Response(
             {"detail": "Verification submitted successfully."},
@@ -356,3 +422,41 @@ class AdminVerificationAuditLogAPIView(generics.ListAPIView):
         return VerificationAuditLog.objects.filter(
             submission_id=submission_id
         ).select_related("admin")
+
+
+class StudentImportAPIView(APIView):
+    """
+    Bulk-create students from an uploaded CSV or JSON Lines file (see
+    users.importing). The file is streamed row by row and passwords are
+    hashed through the process's bounded hashing pool; large files with
+    passwords belong in the import_students command. When that pool is busy
+    the import stops with a 503 whose body reports what was imported and
+    the first line that was not.
+    """
+
+    permission_classes = [IsAdmin]
+    parser_classes = [MultiPartParser, FormParser]
+    serializer_class = StudentImportSerializer
+
+    def post(self, request):
+        serializer = StudentImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        lines = codecs.iterdecode(data["file"], "utf-8-sig")
+        try:
+            result = import_students(
+                read_rows(lines, data["format"]), course_ids=data["courses"]
+            )
+        except (UnicodeDecodeError, ValueError) as exc:
+            raise ValidationError({"file": [str(exc)]})
+
+        if result.stopped_at_line is not None:
+            # Partly applied; the body says how far, and resending is safe
+            return Response(
+                result.as_dict(),
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(HASHING_RETRY_AFTER)},
+            )
+
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)